@@ -0,0 +1,218 @@
+import math
+import time
+import argparse
+import multiprocessing as mp
+import numpy as np
+from config import *
+from simulation import Simulation
+
+# Discrete action space: index -> Simulation action
+ACTIONS = (None, 'up', 'down', 'left', 'right')
+
+# Observation channels (one grid cell per tile)
+OBS_TREE = 0 # Blocks hops
+OBS_HAZARD = 1 # Car / train body
+OBS_LOG = 2 # Standable log
+OBS_WATER = 3 # River with no log
+OBS_WARNING = 4 # Rail lane with a train about to come
+OBS_PLAYER = 5
+OBS_CHANNELS = 6
+
+class CrossyEnv:
+    """
+    Gym-style wrapper around the headless Simulation for training hopping agents.
+    reset() -> obs, step(action) -> (obs, reward, done, info).
+
+    Observations are a float32 grid of (rows_behind + 1 + rows_ahead, COLUMNS, OBS_CHANNELS)
+    centred on the player's row. Reward is +1 per new row reached and `death_penalty` on death.
+    """
+    def __init__(self, seed=None, frame_skip=4, rows_ahead=8, rows_behind=3, max_ticks=60 * 60 * 5, death_penalty=-1.0, seed_stride=1):
+        self.sim = Simulation(seed)
+        # reset() without a seed moves on to the next world: seed, seed + stride, ...
+        self.next_seed = seed
+        self.seed_stride = seed_stride
+        self.frame_skip = frame_skip # Ticks per env step; the action is applied on the first
+        self.rows_ahead = rows_ahead
+        self.rows_behind = rows_behind
+        self.max_ticks = max_ticks
+        self.death_penalty = death_penalty
+        self.obs_shape = (rows_behind + 1 + rows_ahead, COLUMNS, OBS_CHANNELS)
+
+    def reset(self, seed=None):
+        if seed is None and self.next_seed is not None:
+            seed = self.next_seed
+        if seed is not None:
+            self.next_seed = seed + self.seed_stride
+        self.sim.reset(seed)
+        return self.observe()
+
+    def step(self, action):
+        sim = self.sim
+        # Furthest row reached, not the score: the score also counts hops back onto old rows
+        row = sim.max_y // TILE_SIZE
+        for i in range(self.frame_skip):
+            sim.tick(ACTIONS[action] if i == 0 else None)
+            if sim.game_over:
+                break
+
+        reward = float(sim.max_y // TILE_SIZE - row)
+        if sim.game_over:
+            reward += self.death_penalty
+        done = sim.game_over or sim.ticks >= self.max_ticks
+        info = {'score': sim.score, 'status': sim.status, 'ticks': sim.ticks}
+        return self.observe(), reward, done, info
+
+    def observe(self):
+        sim = self.sim
+        obs = np.zeros(self.obs_shape, dtype=np.float32)
+        lanes = sim.get_lanes()
+        cell = SCREEN_WIDTH / COLUMNS
+
+        player = sim.player
+        player_row = -math.floor((player.y + player.height / 2) / TILE_SIZE)
+        # Grid row 0 is the furthest row ahead, like the screen
+        for i in range(obs.shape[0]):
+            lane = lanes.get(player_row + self.rows_ahead - i)
+            if lane is None:
+                continue
+            grid = obs[i]
+            if lane.type == 'river':
+                grid[:, OBS_WATER] = 1.0
+            if getattr(lane, 'train_active', False):
+                grid[:, OBS_WARNING] = 1.0
+
+            for e in lane.entities:
+                if e.image_key == 'tree':
+                    channel = OBS_TREE
+                elif lane.type == 'river':
+                    channel = OBS_LOG
+                else:
+                    channel = OBS_HAZARD
+                # Mark every column the entity's [x, x + width) overlaps
+                first = max(0, int(e.x // cell))
+                last = min(COLUMNS - 1, int((e.x + e.width - 1) // cell))
+                if first <= last:
+                    grid[first:last + 1, channel] = 1.0
+                    if channel == OBS_LOG:
+                        grid[first:last + 1, OBS_WATER] = 0.0
+
+        column = int((player.x + player.width / 2) // cell)
+        if 0 <= column < COLUMNS:
+            obs[self.rows_ahead, column, OBS_PLAYER] = 1.0
+        return obs
+
+
+def _worker(conn, env_kwargs):
+    # One process hosts a slice of the environments and steps them in a loop
+    envs = [CrossyEnv(**kwargs) for kwargs in env_kwargs]
+    try:
+        while True:
+            cmd, data = conn.recv()
+            if cmd == 'step':
+                conn.send(_step_envs(envs, data))
+            elif cmd == 'reset':
+                conn.send(np.stack([env.reset(seed) for env, seed in zip(envs, data)]))
+            elif cmd == 'close':
+                break
+    finally:
+        conn.close()
+
+
+def _step_envs(envs, actions):
+    obs, rewards, dones, scores = [], [], [], []
+    for env, action in zip(envs, actions):
+        o, r, d, info = env.step(int(action))
+        if d:
+            o = env.reset() # Auto-reset; the finished episode's score is still reported
+        obs.append(o)
+        rewards.append(r)
+        dones.append(d)
+        scores.append(info['score'])
+    return (np.stack(obs), np.array(rewards, dtype=np.float32),
+            np.array(dones, dtype=bool), np.array(scores, dtype=np.int32))
+
+
+class VecCrossyEnv:
+    """
+    N independent worlds split across a process pool, stepped in lockstep.
+    step(actions) -> (obs[N, ...], rewards[N], dones[N], info) as NumPy arrays; finished
+    worlds reset automatically. num_workers=0 runs everything in-process (debugging).
+    """
+    def __init__(self, num_envs, num_workers=None, seed=0, context=None, **env_kwargs):
+        self.num_envs = num_envs
+        if num_workers is None:
+            num_workers = mp.cpu_count()
+        num_workers = min(num_workers, num_envs) # Every worker needs at least one env
+        self.num_workers = num_workers
+        # Env i starts from seed + i; each env keeps stepping its own seeded Simulation
+        kwargs = [dict(env_kwargs, seed=seed + i, seed_stride=num_envs) for i in range(num_envs)]
+
+        self.envs = []
+        self.conns = []
+        self.procs = []
+        if num_workers == 0:
+            self.envs = [CrossyEnv(**kw) for kw in kwargs]
+        else:
+            ctx = mp.get_context(context)
+            # Contiguous slices so results concatenate back in env order
+            bounds = np.linspace(0, num_envs, num_workers + 1).astype(int)
+            self.slices = [(bounds[i], bounds[i + 1]) for i in range(num_workers)]
+            for start, end in self.slices:
+                parent, child = ctx.Pipe()
+                proc = ctx.Process(target=_worker, args=(child, kwargs[start:end]), daemon=True)
+                proc.start()
+                child.close()
+                self.conns.append(parent)
+                self.procs.append(proc)
+
+        probe = CrossyEnv(**env_kwargs)
+        self.obs_shape = probe.obs_shape
+        self.num_actions = len(ACTIONS)
+
+    def reset(self, seeds=None):
+        if seeds is None:
+            seeds = [None] * self.num_envs
+        if not self.conns:
+            return np.stack([env.reset(s) for env, s in zip(self.envs, seeds)])
+        for conn, (start, end) in zip(self.conns, self.slices):
+            conn.send(('reset', seeds[start:end]))
+        return np.concatenate([conn.recv() for conn in self.conns])
+
+    def step(self, actions):
+        actions = np.asarray(actions)
+        if not self.conns:
+            obs, rewards, dones, scores = _step_envs(self.envs, actions)
+        else:
+            for conn, (start, end) in zip(self.conns, self.slices):
+                conn.send(('step', actions[start:end]))
+            parts = [conn.recv() for conn in self.conns]
+            obs, rewards, dones, scores = (np.concatenate(p) for p in zip(*parts))
+        return obs, rewards, dones, {'score': scores}
+
+    def close(self):
+        for conn in self.conns:
+            conn.send(('close', None))
+            conn.close()
+        for proc in self.procs:
+            proc.join()
+        self.conns = []
+        self.procs = []
+
+
+if __name__ == "__main__":
+    # Throughput check: random actions, env-steps per second for a given pool size
+    parser = argparse.ArgumentParser(description="Measure VecCrossyEnv throughput")
+    parser.add_argument('--envs', type=int, default=16)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--steps', type=int, default=500)
+    args = parser.parse_args()
+
+    env = VecCrossyEnv(args.envs, args.workers)
+    env.reset()
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        env.step(rng.integers(0, env.num_actions, size=args.envs))
+    elapsed = time.perf_counter() - start
+    env.close()
+    print(f"{args.envs} envs / {env.num_workers} workers: {args.envs * args.steps / elapsed:.0f} env-steps/s")
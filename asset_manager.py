@@ -1,14 +1,46 @@
 
+import os
+import re
+import json
+import time
+import struct
+import hashlib
 import pygame
+import pygame.sysfont
+from collections import OrderedDict
+import config
 from config import *
 
+# (key, system font name, size, bold)
+FONT_SPECS = (('main', "Arial", 24, True), ('score', "Impact", 40, False), ('gameover', "Arial Black", 50, False))
+
+SPRITE_CACHE_MAGIC = b'CRSP'
+# File names _cache_path produces (kind-<16 hex digit key>.ext), the only ones ever pruned
+CACHE_ENTRY_NAMES = {'fonts': re.compile(r'fonts-[0-9a-f]{16}\.json'), 'sprites': re.compile(r'sprites-[0-9a-f]{16}\.bin')}
+ATLAS_WIDTH = 512 # Sprite atlas shelf width (grown to fit the widest sprite)
+
 class AssetManager:
     _instance = None
     
     def __init__(self):
-        self.fonts = {}
+        self._fonts = None # Loaded on first use (or up front by load_assets)
+        self._images = None # Name -> subsurface of `atlas`
+        self.atlas = None # Every generated sprite on one surface
         self.sounds = {}
-        self.images = {}
+        self.audio_ready = None # None until the mixer is first needed; False if there is no device
+        
+        # Derived sprite variants (flipped / shadow), built once and reused every frame.
+        # Bounded LRU so odd sizes can't grow it forever.
+        self.variant_cache = OrderedDict()
+        self.variant_cache_size = VARIANT_CACHE_SIZE
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_evictions = 0
+        
+        # Disk cache for resolved font paths and generated sprite pixels
+        self.disk_cache_dir = ASSET_CACHE_DIR
+        self.load_stats = {} # Timings (ms) and hit/miss of the font and sprite loads
+        self.key = None
         
     @staticmethod
     def get_instance():
@@ -17,21 +49,179 @@ class AssetManager:
         return AssetManager._instance
 
     def load_assets(self):
+        # Everything up front. With FAST_START the game skips this: fonts load when the
+        # menu first draws text and sprites during an idle menu frame.
+        self.load_fonts()
+        self.load_sprites()
+
+    @property
+    def fonts(self):
+        if self._fonts is None:
+            self.load_fonts()
+        return self._fonts
+
+    @property
+    def images(self):
+        if self._images is None:
+            self.load_sprites()
+        return self._images
+
+    def load_fonts(self):
+        if self._fonts is not None:
+            return
+        self._fonts = {}
+        start = time.perf_counter()
         pygame.font.init()
-        # Default font
-        self.fonts['main'] = pygame.font.SysFont("Arial", 24, bold=True)
-        self.fonts['score'] = pygame.font.SysFont("Impact", 40)
-        self.fonts['gameover'] = pygame.font.SysFont("Arial Black", 50)
-        
+        self.load_stats['fonts'] = self._load_fonts(self._get_key())
+        self.load_stats['fonts_ms'] = (time.perf_counter() - start) * 1000.0
+
+    def load_sprites(self):
+        if self._images is not None:
+            return
+        self._images = {}
+        start = time.perf_counter()
         # In a real build with assets, we'd load images here.
-        # Since we are creating a clone from code, we will generate procedural sprites.
+        # Since we are creating a clone from code, we will generate procedural sprites,
+        # or read back the pixels generated by an earlier launch.
+        self.load_stats['sprites'] = self._load_sprites(self._get_key())
+        self.load_stats['sprites_ms'] = (time.perf_counter() - start) * 1000.0
+
+    def init_audio(self):
+        # Opening the audio device can block for a while, so it waits for the first sound.
+        # Real implementation would load .wav files into self.sounds here.
+        if self.audio_ready is None:
+            try:
+                pygame.mixer.init()
+                self.audio_ready = True
+            except pygame.error:
+                self.audio_ready = False # No audio device: play silently
+        return self.audio_ready
+
+    # --- Disk cache ---
+
+    def _get_key(self):
+        if self.key is None:
+            self.key = self._cache_key()
+        return self.key
+
+    def _cache_key(self):
+        # Anything that can change the generated pixels or font choice invalidates the cache
+        digest = hashlib.sha1(pygame.version.ver.encode())
+        for path in (__file__, config.__file__):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        return digest.hexdigest()[:16]
+
+    def _cache_path(self, kind, key):
+        return os.path.join(self.disk_cache_dir, f"{kind}-{key}")
+
+    def _write_cache(self, path, data):
+        # Best effort: a read-only or missing cache dir just means generating every launch
+        try:
+            os.makedirs(self.disk_cache_dir, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+            self._prune_cache(os.path.basename(path))
+        except OSError:
+            pass
+
+    def _prune_cache(self, keep):
+        # Entries of the same kind under another key were written by older code or config
+        # and can never be read again. Only exact generated names: the directory may be shared.
+        pattern = CACHE_ENTRY_NAMES[keep.split('-', 1)[0]]
+        for name in os.listdir(self.disk_cache_dir):
+            if name != keep and pattern.fullmatch(name):
+                try:
+                    os.remove(os.path.join(self.disk_cache_dir, name))
+                except OSError:
+                    pass
+
+    def _load_fonts(self, key):
+        # SysFont scans the system fonts on first use; the cache remembers what it resolved to
+        path = self._cache_path('fonts', key) + '.json' if self.disk_cache_dir else None
+        if path:
+            try:
+                with open(path) as f:
+                    resolved = json.load(f)
+                if all(font_path is None or os.path.exists(font_path) for font_path, _, _ in resolved.values()):
+                    for name, _, size, _ in FONT_SPECS:
+                        font_path, bold, italic = resolved[name]
+                        self.fonts[name] = pygame.sysfont.font_constructor(font_path, size, bold, italic)
+                    return 'hit'
+            except (OSError, ValueError, KeyError):
+                pass
+
+        resolved = {}
+        for name, family, size, bold in FONT_SPECS:
+            def constructor(font_path, size, bold, italic, name=name):
+                resolved[name] = (font_path, bold, italic)
+                return pygame.sysfont.font_constructor(font_path, size, bold, italic)
+            self.fonts[name] = pygame.font.SysFont(family, size, bold=bold, constructor=constructor)
+        if not path:
+            return 'off'
+        self._write_cache(path, json.dumps(resolved).encode())
+        return 'miss'
+
+    def _load_sprites(self, key):
+        # The cache file is the atlas: a header of (name, rect) entries then its raw RGBA pixels
+        path = self._cache_path('sprites', key) + '.bin' if self.disk_cache_dir else None
+        if path:
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                magic, count, width, height = struct.unpack_from('<4sIHH', data)
+                if magic == SPRITE_CACHE_MAGIC:
+                    offset = 12
+                    rects = {}
+                    for _ in range(count):
+                        length, x, y, w, h = struct.unpack_from('<5H', data, offset)
+                        offset += 10
+                        rects[data[offset:offset + length].decode()] = pygame.Rect(x, y, w, h)
+                        offset += length
+                    atlas = pygame.image.frombytes(data[offset:offset + width * height * 4], (width, height), 'RGBA')
+                    self._use_atlas(atlas, rects)
+                    return 'hit'
+            except (OSError, struct.error, ValueError):
+                pass
+
         self._generate_sprites()
-        
-        # Audio - placeholders using pygame.mixer specific generation or empty
-        # We will assume sound files exist or use simple beep generation if possible,
-        # but for now we'll setup the dictionary.
-        # Real implementation would load .wav files.
-        pass
+        rects = self._use_atlas(*self._pack_atlas(self._images))
+        if not path:
+            return 'off'
+        header = [struct.pack('<4sIHH', SPRITE_CACHE_MAGIC, len(rects), *self.atlas.get_size())]
+        for name, rect in rects.items():
+            encoded = name.encode()
+            header.append(struct.pack('<5H', len(encoded), *rect) + encoded)
+        self._write_cache(path, b''.join(header) + pygame.image.tobytes(self.atlas, 'RGBA'))
+        return 'miss'
+
+    def _pack_atlas(self, sprites):
+        # Shelf-pack the sprites, tallest first, and copy them onto one surface
+        width = max(ATLAS_WIDTH, max(s.get_width() for s in sprites.values()))
+        rects = {}
+        x = y = shelf = 0
+        for name, surf in sorted(sprites.items(), key=lambda item: -item[1].get_height()):
+            w, h = surf.get_size()
+            if x + w > width:
+                x, y, shelf = 0, y + shelf, 0
+            rects[name] = pygame.Rect(x, y, w, h)
+            x += w
+            shelf = max(shelf, h)
+        atlas = pygame.Surface((width, y + shelf), pygame.SRCALPHA)
+        for name, rect in rects.items():
+            # MAX onto the cleared atlas copies pixels and alpha exactly (a normal blit would blend)
+            atlas.blit(sprites[name], rect, special_flags=pygame.BLEND_RGBA_MAX)
+        return atlas, rects
+
+    def _use_atlas(self, atlas, rects):
+        # Display pixel format when there is a display: blits from other layouts take a slow path
+        if pygame.display.get_surface() is not None:
+            atlas = atlas.convert_alpha()
+        self.atlas = atlas
+        self._images = {name: atlas.subsurface(rect) for name, rect in rects.items()}
+        return rects
 
     def _generate_sprites(self):
         # Helper to draw a "3D" block (Top + Front view)
@@ -141,7 +331,85 @@ class AssetManager:
 
     def get_image(self, name):
         return self.images.get(name, None)
+
+    def _cached(self, key, build):
+        surf = self.variant_cache.get(key)
+        if surf is not None:
+            self.cache_hits += 1
+            self.variant_cache.move_to_end(key)
+            return surf
+        
+        self.cache_misses += 1
+        surf = build()
+        self.variant_cache[key] = surf
+        if len(self.variant_cache) > self.variant_cache_size:
+            self.variant_cache.popitem(last=False)
+            self.cache_evictions += 1
+        return surf
+
+    def _rotated(self, surf, angle):
+        # Pre-rotated variants only ever go straight to the screen: RLE lets those blits skip the
+        # transparent corners. (Not the flat ones: RLE sources don't blend onto SRCALPHA layers.)
+        surf = pygame.transform.rotate(surf, angle)
+        surf.set_alpha(255, pygame.RLEACCEL)
+        return surf
+
+    def get_variant(self, name, flipped=False, size=None, angle=0):
+        """
+        Sprite facing left (flipped), scaled to `size` and/or pre-rotated by `angle` degrees.
+        Sprites face RIGHT by default, so `flipped` is used for negative speeds.
+        """
+        img = self.images.get(name)
+        if img is None:
+            return None
+        if not flipped and not angle and (size is None or size == img.get_size()):
+            return img
+        
+        def build():
+            surf = img
+            if size is not None and size != img.get_size():
+                surf = pygame.transform.scale(surf, size)
+            if flipped:
+                surf = pygame.transform.flip(surf, True, False)
+            if angle:
+                surf = self._rotated(surf, angle)
+            return surf
+        return self._cached(('variant', name, flipped, size, angle), build)
+
+    def get_shadow(self, name, flipped=False, size=None, angle=0):
+        """
+        Flattened ground shadow for a sprite (cast Bottom-Right, light from Top-Left).
+        The ellipse is symmetric, but facing is part of the key so shaped shadows can drop in later.
+        """
+        if angle:
+            flat = self.get_shadow(name, flipped, size)
+            if flat is None:
+                return None
+            return self._cached(('shadow', name, flipped, size, angle), lambda: self._rotated(flat, angle))
+        
+        img = self.get_variant(name, flipped, size)
+        if img is None:
+            return None
+        
+        def build():
+            shadow_width = img.get_width()
+            shadow_height = max(5, img.get_height() // 4) # Flattened
+            s_surf = pygame.Surface((shadow_width, shadow_height), pygame.SRCALPHA)
+            pygame.draw.ellipse(s_surf, (0, 0, 0, 80), (0, 0, shadow_width, shadow_height))
+            return s_surf
+        return self._cached(('shadow', name, flipped, size, 0), build)
+
+    def cache_stats(self):
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            'size': len(self.variant_cache),
+            'capacity': self.variant_cache_size,
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'evictions': self.cache_evictions,
+            'hit_rate': self.cache_hits / lookups if lookups else 0.0,
+        }
         
     def play_sound(self, name):
-        if name in self.sounds:
+        if name in self.sounds and self.init_audio():
             self.sounds[name].play()
@@ -0,0 +1,254 @@
+"""
+Benchmark suite: per-subsystem timings for a fixed, seeded run under the SDL dummy driver.
+
+    python benchmark.py                           # run, print, write benchmark_results.json
+    python benchmark.py --save-baseline           # also store the results as the baseline
+    python benchmark.py --baseline my_base.json   # flag regressions against a stored baseline
+
+Exits with status 1 when any subsystem's mean time regressed past --threshold.
+"""
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import sys
+import json
+import time
+import platform
+import subprocess
+import argparse
+import tempfile
+import numpy as np
+import pygame
+from config import *
+
+DEFAULT_RESULTS = 'benchmark_results.json'
+DEFAULT_BASELINE = 'benchmark_baseline.json'
+
+def timed(obj, name, samples):
+    # Wrap a bound method so every call appends its duration (seconds) to `samples`
+    method = getattr(obj, name)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        result = method(*args, **kwargs)
+        samples.append(time.perf_counter() - start)
+        return result
+    setattr(obj, name, wrapper)
+
+def summarize(samples):
+    ms = np.asarray(samples) * 1000.0
+    return {
+        'mean_ms': float(ms.mean()),
+        'p50_ms': float(np.percentile(ms, 50)),
+        'p99_ms': float(np.percentile(ms, 99)),
+        'samples': int(ms.size),
+    }
+
+def bench_frames(frames, seed, hop_every):
+    """
+    Scripted run through Game: sim tick + render per frame. The scripted player cannot die
+    (frames on which it would die are only counted), so every frame is a later point of one continuous run: the
+    camera climbs, lanes are culled and traffic reaches a steady state, whatever the seed.
+    Returns the samples, the entity pool counters and a summary of the workload.
+    """
+    from game import Game
+    from chunk_stream import ChunkStream
+    game = Game()
+    game.asset_manager.load_assets() # Fast start defers the sprites; keep that out of the frame timings
+    game.reset_game()
+    sim = game.sim
+    sim.reset(seed)
+    game.state = 'PLAYING'
+
+    death_frames = 0 # Frames on which the player would have died
+    def end_run():
+        # Collisions are still checked (and timed); the run just goes on
+        nonlocal death_frames
+        death_frames += 1
+    sim.end_run = end_run
+
+    samples = {name: [] for name in ('world_update', 'lane_update', 'add_chunk', 'collisions', 'render_playing', 'frame')}
+    timed(sim.world_generator, 'update', samples['world_update'])
+    timed(sim.world_generator, 'update_lanes', samples['lane_update'])
+    timed(sim.world_generator, 'add_chunk', samples['add_chunk']) # The frame's share of chunk building
+    timed(sim.collision_manager, 'check_collisions', samples['collisions'])
+    timed(game, 'render_playing', samples['render_playing'])
+
+    sidestep = None # Set when a hop forward was blocked (tree, edge): try this way next frame
+    for i in range(frames):
+        action = sidestep or ('up' if i % hop_every == 0 else None)
+        start = time.perf_counter()
+        sim.tick(action)
+        game.render_playing()
+        samples['frame'].append(time.perf_counter() - start)
+        # Blocked hop: try left, then right, then wait for the next hop forward
+        sidestep = None
+        if action and not sim.player.is_moving:
+            sidestep = {'up': 'left', 'left': 'right'}.get(action)
+
+    world = sim.world_generator
+    # Frames that found no chunk ready and blocked on the streaming thread (None: built inline)
+    chunk_waits = world.chunks.waits if isinstance(world.chunks, ChunkStream) else None
+    workload = {'chunk_waits': chunk_waits, 'death_frames': death_frames, 'resets': 0, 'rows': int(sim.max_y // TILE_SIZE),
+                'lanes_generated': world.lane_index, 'lanes_live': len(world.lanes), 'entities_live': len(world.store)}
+    return samples, world.pool.pool_stats(), workload
+
+def bench_quality(frames, seed):
+    """render_playing at every quality tier, on the same mid-run world."""
+    from game import Game
+    from quality import QUALITY_TIERS
+    game = Game()
+    game.asset_manager.load_assets()
+    game.sim.reset(seed)
+    for i in range(90):
+        game.sim.tick('up' if i % 15 == 0 else None)
+
+    samples = {}
+    for tier in QUALITY_TIERS:
+        game.world_renderer.set_quality(tier)
+        game.render_playing() # Build the tier's strips and overlays outside the timings
+        times = samples[f'quality_{tier.name}'] = []
+        for _ in range(frames):
+            start = time.perf_counter()
+            game.render_playing()
+            times.append(time.perf_counter() - start)
+    return samples
+
+def bench_load_assets(reps, cache_dir=None):
+    """
+    Fresh AssetManagers (not the singleton) loading every asset. Without `cache_dir` the disk
+    cache is off and each rep generates everything (a cold load); with it, each rep reads back
+    what an untimed first load wrote there (a warm launch).
+    """
+    from asset_manager import AssetManager
+    if cache_dir:
+        manager = AssetManager()
+        manager.disk_cache_dir = cache_dir
+        manager.load_assets()
+    samples = []
+    for _ in range(reps):
+        manager = AssetManager()
+        manager.disk_cache_dir = cache_dir
+        start = time.perf_counter()
+        manager.load_assets()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+# Runs in a fresh interpreter: launch -> modules imported -> menu frame presented
+STARTUP_PROBE = '''
+import time
+start = time.perf_counter()
+import pygame
+from game import Game
+imported = time.perf_counter()
+game = Game(launch_time=start)
+pygame.display.update(game.render_menu())
+print(imported - start, time.perf_counter() - start)
+'''
+
+def bench_startup(reps, fast_start):
+    """Cold launches in subprocesses. Returns (import, first frame) samples in seconds."""
+    env = dict(os.environ, CROSSY_FAST_START='1' if fast_start else '0', PYGAME_HIDE_SUPPORT_PROMPT='1')
+    imports, first_frames = [], []
+    for _ in range(reps):
+        out = subprocess.run([sys.executable, '-c', STARTUP_PROBE], env=env, capture_output=True, text=True,
+                             check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        imported, shown = map(float, out.split()[-2:])
+        imports.append(imported)
+        first_frames.append(shown)
+    return imports, first_frames
+
+def run(args):
+    samples, pool, workload = bench_frames(args.frames, args.seed, args.hop_every)
+    samples.update(bench_quality(args.quality_frames, args.seed))
+    samples['load_assets'] = bench_load_assets(args.asset_reps)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        samples['load_assets_warm'] = bench_load_assets(args.asset_reps, cache_dir)
+    samples['startup_import'], samples['first_frame'] = bench_startup(args.startup_reps, True)
+    samples['first_frame_eager'] = bench_startup(args.startup_reps, False)[1]
+    results = {name: summarize(s) for name, s in samples.items() if s}
+    frame_total = sum(samples['frame'])
+    return {
+        'meta': {
+            'frames': args.frames,
+            'seed': args.seed,
+            'render_path': RENDER_PATH,
+            'render_scale': RENDER_SCALE,
+            'sim_rate': SIM_RATE,
+            'streaming': WORLD_STREAMING,
+            'hop_every': args.hop_every,
+            **workload,
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'machine': platform.machine(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'fps': args.frames / frame_total if frame_total else 0.0,
+        'results': results,
+        'pool': pool,
+    }
+
+def compare(report, baseline, threshold):
+    """Names whose mean got slower than baseline by more than `threshold` (fraction)."""
+    regressions = []
+    for name, stats in report['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if not base or base['mean_ms'] <= 0:
+            continue
+        ratio = stats['mean_ms'] / base['mean_ms']
+        stats['baseline_mean_ms'] = base['mean_ms']
+        stats['ratio'] = ratio
+        if ratio > 1.0 + threshold:
+            regressions.append(name)
+    return regressions
+
+def print_report(report, regressions):
+    meta = report['meta']
+    print(f"{meta['frames']} frames, seed {meta['seed']}, render path '{meta['render_path']}', scale {meta['render_scale']}")
+    print(f"workload: {meta['rows']} rows climbed, {meta['lanes_generated']} lanes generated, "
+          f"{meta['entities_live']} moving entities at the end, {meta['death_frames']} death frames ignored, {meta['resets']} resets")
+    if meta['chunk_waits'] is not None:
+        print(f"chunk stream: {meta['chunk_waits']} frames blocked waiting for a chunk")
+    print(f"{'subsystem':<22}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}{'vs base':>10}")
+    for name, stats in report['results'].items():
+        ratio = f"{stats['ratio']:.2f}x" if 'ratio' in stats else '-'
+        flag = '  REGRESSION' if name in regressions else ''
+        print(f"{name:<22}{stats['mean_ms']:>10.3f}{stats['p50_ms']:>10.3f}{stats['p99_ms']:>10.3f}{ratio:>10}{flag}")
+    print(f"fps: {report['fps']:.1f}")
+    pool = report['pool']
+    print(f"entity pool: {pool['size']} free, {pool['created']} created, reuse rate {pool['reuse_rate']:.0%}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-subsystem benchmark (SDL dummy driver)")
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--hop-every', type=int, default=12, help="Scripted hop forward every N frames")
+    parser.add_argument('--quality-frames', type=int, default=200, help="Frames rendered per quality tier")
+    parser.add_argument('--asset-reps', type=int, default=5)
+    parser.add_argument('--startup-reps', type=int, default=3, help="Cold launches per startup mode")
+    parser.add_argument('--output', default=DEFAULT_RESULTS)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--threshold', type=float, default=0.20, help="Allowed slowdown before flagging (0.20 = 20%%)")
+    args = parser.parse_args()
+
+    report = run(args)
+
+    regressions = []
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+    report['regressions'] = regressions
+
+    print_report(report, regressions)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    pygame.quit()
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
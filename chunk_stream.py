@@ -0,0 +1,49 @@
+import queue
+import threading
+
+class ChunkStream:
+    """
+    Runs a chunk generator on a daemon thread and keeps up to `lookahead` finished chunks
+    queued, so the frame that needs new lanes only dequeues them.
+    Iterates like the generator it wraps; close() stops the worker.
+    """
+    def __init__(self, source, lookahead=4):
+        self.queue = queue.Queue(maxsize=lookahead)
+        self.stopped = threading.Event()
+        self.waits = 0 # Times the main thread found the queue empty and had to block
+        self.thread = threading.Thread(target=self.run, args=(source,), daemon=True)
+        self.thread.start()
+
+    def run(self, source):
+        try:
+            for chunk in source:
+                if not self.put(chunk):
+                    return
+        except Exception as e:
+            self.put(e) # Re-raised on the main thread by __next__
+
+    def put(self, item):
+        # Block while the queue is full, but keep checking for close()
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            chunk = self.queue.get_nowait()
+        except queue.Empty:
+            self.waits += 1
+            chunk = self.queue.get()
+        if isinstance(chunk, Exception):
+            raise chunk
+        return chunk
+
+    def close(self):
+        self.stopped.set()
@@ -1,26 +1,37 @@
 
-import pygame
 from config import *
 
 class CollisionManager:
+    """
+    Lanes are 1D: within a lane every obstacle spans [x, x + width) at the lane's y.
+    Hits are tested on those intervals swept over the whole frame, so fast obstacles
+    (trains move 30+ px per frame) can't tunnel through the player on a slow frame.
+    No Rects are built in the per-frame checks.
+    """
     def __init__(self, player):
         self.player = player
+        self.last_x = player.x # Player x at the start of the current frame
 
     def can_move(self, target_x, target_y, lanes):
         """
         Check if the target position is blocked by a static obstacle (Tree, Rock).
         Dynamic obstacles (activatable) might also block.
         """
-        player_rect = pygame.Rect(target_x + 5, target_y + 5, TILE_SIZE - 10, TILE_SIZE - 10)
+        # Target footprint, 5px inside the tile
+        left = target_x + 5
+        right = left + TILE_SIZE - 10
+        top = target_y + 5
+        bottom = top + TILE_SIZE - 10
         
-        # Optimize: Only check lanes near target_y
-        for lane in lanes:
-            if abs(lane.y - target_y) < TILE_SIZE:
+        # Only the (at most two) lanes within a tile of target_y can block
+        for lane in (lanes.lane_at(target_y), lanes.lane_at(target_y + TILE_SIZE)):
+            if lane is not None and abs(lane.y - target_y) < TILE_SIZE:
                 for entity in lane.entities:
                     # Static obstacles typically have 'tree' in image key or are distinct class
                     # Ideally we check type. 
                     if hasattr(entity, 'image_key') and 'tree' in str(entity.image_key): 
-                        if player_rect.colliderect(entity.get_rect()):
+                        if (entity.x < right and left < entity.x + entity.width and
+                                entity.y < bottom and top < entity.y + entity.height):
                             return False
         return True
 
@@ -29,32 +40,43 @@ class CollisionManager:
         Run every frame. Checks for death conditions or riding logic.
         Returns: 'alive', 'dead', 'drowned', 'hit'
         """
-        if self.player.is_moving:
-            # While hopping, usually invulnerable to "falling" but vulnerable to "hits"?
-            # Crossy Road: You can jump INTO a car and die.
-            # You can jump ONTO a log.
-            pass
+        status = self._check(lanes, dt)
+        self.last_x = self.player.x # Includes any log drift applied this frame
+        return status
 
-        player_rect = self.player.get_rect()
-        # Shrink hitbox slightly for fairness, but not too much preventing log detection
-        player_hitbox = player_rect.inflate(-4, -4)
+    def _check(self, lanes, dt):
+        # While hopping you can still jump INTO a car and die, or ONTO a log.
+        player = self.player
         
-        center_y = self.player.y + self.player.height / 2
+        center_y = player.y + player.height / 2
+        
+        # Find current lane (lane.y is top; LaneRing maps y to its row directly)
+        current_lane = lanes.lane_at(center_y)
         
-        # Find current lane
-        current_lane = None
-        for lane in lanes:
-            if lane.y <= center_y < lane.y + TILE_SIZE: # strictly, lane.y is top
-                current_lane = lane
-                break
-                
         if not current_lane:
             return 'alive' # Should not happen unless out of bounds logic
             
         # 1. Check Vehicle/Train Collisions (Instant Death)
         if current_lane.type in ['road', 'rail']:
+            # Shrink hitbox slightly for fairness (2px per side)
+            width = player.width - 4
+            start = self.last_x + 2
+            end = player.x + 2
+            top = player.y + 2
+            bottom = player.y + player.height - 2
+            
             for entity in current_lane.entities:
-                if entity.get_rect().colliderect(player_hitbox):
+                if not (entity.y < bottom and top < entity.y + entity.height):
+                    continue
+                # Obstacle offset relative to the player is linear over the frame, so the
+                # intervals overlap at some instant iff that offset's range meets (-entity.width, width).
+                # (Entities spawned this frame haven't moved yet; they spawn off-screen, so sweeping
+                # them back is harmless.)
+                x_end = entity.x
+                x_start = x_end - entity.speed * dt
+                d_start = x_start - start
+                d_end = x_end - end
+                if min(d_start, d_end) < width and max(d_start, d_end) > -entity.width:
                     return 'hit'
 
         # 2. Check River Logic
@@ -63,23 +85,29 @@ class CollisionManager:
             log_speed = 0
             
             # Use full player rect for safety checks (easier to land on logs)
-            # And slightly inflate log hitbox to be generous
+            # And slightly inflate log hitbox to be generous (2px per side)
+            # Riding is sampled at the end of the frame: a log that only passed under you mid-frame doesn't count.
+            left = player.x
+            right = player.x + player.width
+            top = player.y
+            bottom = player.y + player.height
             for entity in current_lane.entities:
-                if entity.get_rect().inflate(4, 4).colliderect(player_rect):
+                if (entity.x - 2 < right and left < entity.x + entity.width + 2 and
+                        entity.y - 2 < bottom and top < entity.y + entity.height + 2):
                     on_log = True
                     log_speed = entity.speed
                     break
             
             if on_log:
                 # Move player with log
-                self.player.x += log_speed * dt
+                player.x += log_speed * dt
                 # Ensure player stays in bounds (optional, usually player dies if log goes off screen?)
                 # We won't clamp here, but let the player drift off screen (death condition logic elsewhere or camera catchup)
                 return 'riding'
             else:
                 # If not moving (hopping through air) and not on log -> Drown
                 # If we are strictly "in the air" (z > 0), we don't drown yet
-                if self.player.z <= 0:
+                if player.z <= 0:
                     return 'drowned'
                     
         return 'alive'
@@ -1,12 +1,27 @@
 
-import pygame
+import os
 
 # Screen
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
-FPS = 60
+FPS = 60 # Nominal frame rate: the frame-time budget
+RENDER_FPS = int(os.environ.get('CROSSY_RENDER_FPS', FPS)) # Frame cap for the display; 0 = uncapped
+SIM_RATE = int(os.environ.get('CROSSY_SIM_RATE', FPS)) # Simulation ticks per second
+SIM_DT = 1.0 / SIM_RATE # Fixed simulation timestep (seconds)
+# Fixed timestep: the simulation advances in SIM_DT ticks, as many per frame as the elapsed time
+# covers, and frames draw interpolated between the last two ticks. Deterministic for a given seed
+# and input. CROSSY_FIXED_TIMESTEP=0 restores one variable-dt step per frame.
+FIXED_TIMESTEP = os.environ.get('CROSSY_FIXED_TIMESTEP', '1') != '0'
+MAX_FRAME_TIME = 0.25 # Elapsed time simulated per frame is capped, so a stall can't snowball
+# World seed for the interactive game (CROSSY_SEED); None -> a new random world every run
+GAME_SEED = int(os.environ['CROSSY_SEED']) if os.environ.get('CROSSY_SEED') else None
 TITLE = "Crossy Road Python"
 
+# World streaming: biome chunks are built on a worker thread, CHUNK_LOOKAHEAD chunks ahead.
+# CROSSY_STREAMING=0 builds them inline in the frame instead (same world for a given seed).
+WORLD_STREAMING = os.environ.get('CROSSY_STREAMING', '1') != '0'
+CHUNK_LOOKAHEAD = 4
+
 # Grid / World
 TILE_SIZE = 40  # Base size of a grid cell
 GRID_WIDTH = 13 # Number of tiles horizontally
@@ -34,6 +49,44 @@ PLAYER_COLOR = (255, 255, 255) # Chicken white
 SCROLL_SPEED_INITIAL = 30 # Pixels per second camera creep (if applicable) or player driven
 GAME_SPEED_INCREASE = 0.05 # Multiplier per score bracket
 
+# On-disk cache of resolved font paths and generated sprite pixels (CROSSY_ASSET_CACHE='' disables)
+ASSET_CACHE_DIR = os.environ.get('CROSSY_ASSET_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'crossy_road'))
+# Fast start: show the menu first; sprites load on an idle menu frame and audio on the first
+# sound. CROSSY_FAST_START=0 initializes every pygame module and loads all assets up front.
+FAST_START = os.environ.get('CROSSY_FAST_START', '1') != '0'
+
+# Rendering
+VARIANT_CACHE_SIZE = 128 # Max cached flipped/shadow sprite variants (LRU)
+TILT_ANGLE = 345 # Fake 3D camera: world rotated 15 degrees clockwise
+# 'affine': pre-rotated strips/sprites placed directly (fast), 'rotate': rotate the full world buffer per frame
+RENDER_PATH = os.environ.get('CROSSY_RENDER_PATH', 'affine')
+COLOR_STRIP_KEY = (255, 0, 255) # Transparent padding around pre-rotated lane strips
+# Internal resolution of the world pass (0.5 = half width and height), upscaled once to the
+# window; the UI always draws at native resolution. The upscale is nearest-neighbour unless
+# CROSSY_RENDER_SMOOTH=1 (smoothscale: softer, but ~2 ms a frame at 800x600).
+RENDER_SCALE = min(1.0, max(0.25, float(os.environ.get('CROSSY_RENDER_SCALE', '1.0'))))
+RENDER_SMOOTH = os.environ.get('CROSSY_RENDER_SMOOTH', '0') == '1'
+# Adaptive quality (quality.py): when the rolling frame time misses the budget, step down a tier;
+# step back up after a sustained stretch under the headroom fraction of it.
+# CROSSY_QUALITY=auto (default) adapts, CROSSY_QUALITY=<tier index> pins one tier (0 = full quality).
+QUALITY_MODE = os.environ.get('CROSSY_QUALITY', 'auto')
+QUALITY_BUDGET_MS = float(os.environ.get('CROSSY_QUALITY_BUDGET_MS', 1000.0 / FPS))
+QUALITY_WINDOW = 30 # Frames averaged per decision
+QUALITY_HEADROOM = 0.6 # Step up only while under this fraction of the budget...
+QUALITY_RECOVER_FRAMES = 180 # ...for this many frames in a row (doubled after each bounce back down)
+
+# Snapshots: F5 saves the run here, F9 restores it (CROSSY_SNAPSHOT overrides the path)
+SNAPSHOT_PATH = os.environ.get('CROSSY_SNAPSHOT', 'crossy_snapshot.bin')
+
+# Replays: CROSSY_RECORD=<path> records each run's seed and inputs (to <path stem>-001<ext>, -002, ...); CROSSY_REPLAY=<path> plays one back
+REPLAY_RECORD = os.environ.get('CROSSY_RECORD') or None
+REPLAY_PLAY = os.environ.get('CROSSY_REPLAY') or None
+
+# Profiling: CROSSY_PROFILE=1 starts with the frame profiler on (F3 toggles it in game);
+# CROSSY_PROFILE_CSV=<path> streams one row per profiled frame.
+PROFILE_ENABLED = os.environ.get('CROSSY_PROFILE', '0') == '1'
+PROFILE_CSV = os.environ.get('CROSSY_PROFILE_CSV') or None
+
 # Z-Layers
 LAYER_GROUND = 0
 LAYER_WATER_OBJECT = 1 # Logs
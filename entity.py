@@ -1,8 +1,10 @@
 
-import pygame
 from config import *
 
 class Entity:
+    # Slots instead of a per-instance __dict__: thousands of these churn over a long run
+    __slots__ = ('x', 'y', 'width', 'height', 'color', 'active', 'image_key', 'grid_x', 'grid_y')
+
     def __init__(self, x, y, width, height, color=(255,0,255)):
         self.x = x # World coordinate X
         self.y = y # World coordinate Y (row * TILE_SIZE usually)
@@ -20,6 +22,8 @@ class Entity:
         pass
 
     def render(self, surface, camera, asset_manager):
+        # Drawing helpers import pygame lazily: the headless Simulation never loads it
+        import pygame
         # Calculate screen position
         screen_y = camera.apply(self.y)
         
@@ -41,4 +45,38 @@ class Entity:
                 pygame.draw.rect(surface, self.color, rect)
                 
     def get_rect(self):
+        import pygame
         return pygame.Rect(self.x, self.y, self.width, self.height)
+
+
+class MovingEntity(Entity):
+    """
+    Entity moving at constant horizontal speed (cars, trains, logs).
+    Once an EntityStore binds it to a row, x is computed from the row's spawn
+    position and time; unbound it keeps the x it was given.
+    """
+    __slots__ = ('_x', 'store', 'slot', 'lane_id', 'speed')
+    kind = None # KIND_* obstacle type
+
+    def __init__(self, x, y, width, height, speed):
+        self.store = None
+        self.slot = -1
+        self.lane_id = -1
+        super().__init__(x, y, width, height)
+        self.speed = speed # Pixels per second. Can be negative for leftward movement.
+
+    @property
+    def x(self):
+        slot = self.slot
+        if slot < 0:
+            return self._x
+        # EntityStore.x_at, inlined: read on every collision check and draw
+        store = self.store
+        return store.x[slot] + store.speed[slot] * (store.time - store.t0[slot])
+
+    @x.setter
+    def x(self, value):
+        if self.slot < 0:
+            self._x = value
+        else:
+            self.store.set_x(self.slot, value)
@@ -0,0 +1,39 @@
+class EntityPool:
+    """
+    Free lists of despawned cars, logs and trains, one per class.
+    Lanes acquire() instead of constructing, and despawned entities come back via release(),
+    so a long run settles on a fixed set of objects instead of feeding the garbage collector.
+    """
+    def __init__(self):
+        self.free = {} # Class -> released instances
+        self.created = 0
+        self.reused = 0
+        self.released = 0
+
+    def acquire(self, cls, *args):
+        free = self.free.get(cls)
+        if free:
+            entity = free.pop()
+            entity.__init__(*args) # Re-initialize in place
+            self.reused += 1
+        else:
+            entity = cls(*args)
+            self.created += 1
+        return entity
+
+    def release(self, entity):
+        self.free.setdefault(type(entity), []).append(entity)
+        self.released += 1
+
+    def __len__(self):
+        return sum(len(free) for free in self.free.values())
+
+    def pool_stats(self):
+        acquired = self.created + self.reused
+        return {
+            'size': len(self),
+            'created': self.created,
+            'reused': self.reused,
+            'released': self.released,
+            'reuse_rate': self.reused / acquired if acquired else 0.0,
+        }
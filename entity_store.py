@@ -0,0 +1,144 @@
+import heapq
+from array import array
+from config import *
+
+# Obstacle types (MovingEntity.kind)
+KIND_CAR = 0
+KIND_LOG = 1
+KIND_TRAIN = 2
+
+class EntityStore:
+    """
+    Rows of spawn state (x, t0, speed) for every moving obstacle (cars, logs, trains) across
+    all lanes. Motion is closed-form: a row keeps its x at spawn time t0, and x at any time t
+    is x + speed * (t - t0). Nothing is stepped per frame; each row's despawn time is known
+    at spawn and kept in a heap, so a frame only pays for the rows that actually leave.
+
+    Entities stay as thin handles in `lane.entities`; a bound handle computes its x from row `slot`.
+    Rows are only ever read one at a time, so they are plain `array('d')` columns: an element
+    read is a Python float, much cheaper than indexing a NumPy array.
+    """
+    def __init__(self, capacity=64):
+        self.capacity = 0
+        self.time = 0.0 # Sim clock, advanced by update(dt)
+        self.x = array('d') # x at t0
+        self.t0 = array('d')
+        self.speed = array('d')
+        self.alive = bytearray()
+        self.serial = [] # Bumped whenever a row is (re)scheduled; stale exits are skipped
+        self.exits = [] # Min-heap of (despawn time, serial, slot)
+        self.handles = []
+        self.free = [] # Min-heap of free rows, keeps live rows packed at the front
+        self.count = 0 # Live rows
+        self.pending = [] # Spawned this frame, inserted as one batch on the next update
+
+        # Entities are culled once fully outside this band (matches the old per-lane filter)
+        self.min_x = -200
+        self.max_x = SCREEN_WIDTH + 200
+
+        self._grow(capacity)
+
+    def __len__(self):
+        return self.count + len(self.pending)
+
+    def _grow(self, capacity):
+        extra = capacity - self.capacity
+        zeros = array('d', bytes(8 * extra))
+        self.x.extend(zeros)
+        self.t0.extend(zeros)
+        self.speed.extend(zeros)
+        self.alive.extend(bytes(extra))
+        self.serial.extend([0] * extra)
+        self.handles.extend([None] * extra)
+        for slot in range(self.capacity, capacity):
+            heapq.heappush(self.free, slot)
+        self.capacity = capacity
+
+    def add(self, entity, lane_id):
+        entity.lane_id = lane_id
+        self.pending.append(entity)
+
+    def flush(self):
+        pending = self.pending
+        if not pending:
+            return
+        self.pending = []
+
+        needed = len(pending) - len(self.free)
+        if needed > 0:
+            self._grow(max(self.capacity * 2, self.capacity + needed))
+
+        for e in pending:
+            slot = heapq.heappop(self.free)
+            self.x[slot] = e._x
+            self.t0[slot] = self.time # Spawned during the previous frame's lane events
+            self.speed[slot] = e.speed
+            self.alive[slot] = True
+            self.handles[slot] = e
+            e.store = self
+            e.slot = slot
+            self.schedule_exit(slot)
+        self.count += len(pending)
+
+    def schedule_exit(self, slot):
+        # When the row leaves the play band: at once if it starts outside it,
+        # otherwise when it reaches the far edge in its direction of travel
+        x = self.x[slot]
+        speed = self.speed[slot]
+        if x <= self.min_x or x >= self.max_x:
+            due = self.t0[slot]
+        elif speed > 0:
+            due = self.t0[slot] + (self.max_x - x) / speed
+        elif speed < 0:
+            due = self.t0[slot] + (self.min_x - x) / speed
+        else:
+            return # Never leaves
+        self.serial[slot] += 1
+        heapq.heappush(self.exits, (due, self.serial[slot], slot))
+
+    def x_at(self, slot, t=None):
+        """x of a row at sim time t (default: now)."""
+        if t is None:
+            t = self.time
+        return self.x[slot] + self.speed[slot] * (t - self.t0[slot])
+
+    def set_x(self, slot, value):
+        # Rebase the row at the current time
+        self.x[slot] = value
+        self.t0[slot] = self.time
+        self.schedule_exit(slot)
+
+    def update(self, dt):
+        """
+        Insert pending spawns, advance the clock, cull what left the play band.
+        Returns the handles that were despawned so their lanes can drop them.
+        """
+        self.flush()
+        self.time += dt
+
+        exits = self.exits
+        despawned = []
+        while exits and exits[0][0] <= self.time:
+            _, serial, slot = heapq.heappop(exits)
+            if serial != self.serial[slot] or not self.alive[slot]:
+                continue # Row was removed or rescheduled since
+            e = self.handles[slot]
+            self.remove(e)
+            despawned.append(e)
+        return despawned
+
+    def remove(self, entity):
+        if entity.slot < 0:
+            # Never flushed (spawned and discarded in the same frame)
+            if entity in self.pending:
+                self.pending.remove(entity)
+            return
+        slot = entity.slot
+        entity._x = self.x_at(slot) # Handle keeps its last position once unbound
+        entity.store = None
+        entity.slot = -1
+        self.handles[slot] = None
+        self.alive[slot] = False
+        self.serial[slot] += 1 # Invalidates its pending exit
+        heapq.heappush(self.free, slot)
+        self.count -= 1
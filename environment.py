@@ -1,22 +1,22 @@
 
-import pygame
 from config import *
-from entity import Entity
+from entity import Entity, MovingEntity
+from entity_store import KIND_LOG
 
 class Obstacle(Entity):
+    __slots__ = ()
+
     def __init__(self, x, y):
         super().__init__(x, y, TILE_SIZE, TILE_SIZE)
         self.image_key = 'tree'
         # Hitbox might be smaller than visual
         
-class Log(Entity):
+class Log(MovingEntity):
+    __slots__ = ()
+    kind = KIND_LOG
+
     def __init__(self, x, y, width, speed):
-        super().__init__(x, y, width, TILE_SIZE)
+        super().__init__(x, y, width, TILE_SIZE, speed)
         self.image_key = 'log_medium'
         if width < TILE_SIZE * 2.5: self.image_key = 'log_small'
         elif width > TILE_SIZE * 3.5: self.image_key = 'log_large'
-        
-        self.speed = speed
-
-    def update(self, dt):
-        self.x += self.speed * dt
@@ -9,7 +9,11 @@ class InputManager:
             'left': False,
             'right': False,
             'quit': False,
-            'confirm': False
+            'confirm': False,
+            'redraw': False, # Window was exposed/restored, cached frames must be repainted
+            'profile': False, # Toggle the frame profiler overlay
+            'save': False, # Write a snapshot of the run
+            'load': False # Restore the last snapshot
         }
         self.previous_key_state = {}
 
@@ -23,6 +27,9 @@ class InputManager:
             if event.type == pygame.QUIT:
                 self.actions['quit'] = True
             
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED):
+                self.actions['redraw'] = True
+            
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_UP or event.key == pygame.K_w:
                     self.actions['up'] = True
@@ -36,6 +43,12 @@ class InputManager:
                     self.actions['confirm'] = True
                 elif event.key == pygame.K_ESCAPE:
                     self.actions['quit'] = True
+                elif event.key == pygame.K_F3:
+                    self.actions['profile'] = True
+                elif event.key == pygame.K_F5:
+                    self.actions['save'] = True
+                elif event.key == pygame.K_F9:
+                    self.actions['load'] = True
 
     def get_action(self, action_name):
         return self.actions.get(action_name, False)
@@ -1,30 +1,50 @@
 
-import pygame
 import random
 from config import *
 from vehicles import Vehicle, Train
 from environment import Obstacle, Log
 
 class Lane:
-    def __init__(self, y_pos, index):
+    def __init__(self, y_pos, index, store=None, pool=None):
         self.y = y_pos
         self.index = index
         self.entities = []
         self.type = "grass"
+        # Shared EntityStore that moves and culls this lane's obstacles in bulk
+        # (see WorldGenerator.update); lanes have no per-frame update of their own
+        self.store = store
+        # Shared EntityPool that spawned obstacles come from and despawned ones return to
+        self.pool = pool
         
-    def update(self, dt):
-        # Update all entities
-        for e in self.entities:
-            e.update(dt)
+    def initial_event(self):
+        # First (delay, event) for the SpawnScheduler; None for lanes without events
+        return None
+        
+    def fire(self, event):
+        # Handle a scheduled event; returns the next (delay, event) or None
+        return None
+        
+    def spawn(self, cls, *args):
+        # Recycle a pooled instance when there is one
+        entity = self.pool.acquire(cls, *args) if self.pool is not None else cls(*args)
+        self.add_entity(entity)
+        
+    def add_entity(self, entity):
+        self.entities.append(entity)
+        if self.store is not None:
+            self.store.add(entity, self.index)
             
-        # Remove off-screen entities
-        # Assuming world width is somewhat finite or we cull far off entities
-        # But we need infinite horizontal for scrolling? 
-        # Actually Crossy Road is bounded horizontally usually ~15-20 tiles wide
-        # Entities spawn from one side and exit the other.
-        self.entities = [e for e in self.entities if -200 < e.x < SCREEN_WIDTH + 200]
+    def release(self):
+        # Lane culled: free its rows in the shared store and recycle its moving obstacles
+        for e in self.entities:
+            if getattr(e, 'kind', None) is not None:
+                if self.store is not None:
+                    self.store.remove(e)
+                if self.pool is not None:
+                    self.pool.release(e)
         
     def render_background(self, surface, camera):
+        import pygame # Display only; see Entity.render
         screen_y = camera.apply(self.y)
         if -TILE_SIZE < screen_y < SCREEN_HEIGHT:
             color = COLOR_GRASS
@@ -52,8 +72,9 @@ class Lane:
 
 
 class GrassLane(Lane):
-    def __init__(self, y_pos, index):
-        super().__init__(y_pos, index)
+    def __init__(self, y_pos, index, rng=random, store=None, pool=None):
+        super().__init__(y_pos, index, store, pool)
+        self.rng = rng
         self.type = 'grass'
         self.obstacle_chance = 0.2
         self.setup_obstacles()
@@ -65,7 +86,7 @@ class GrassLane(Lane):
         
         for i in range(COLUMNS):
             # Reduced chance slightly to 0.15 + Check consecutive limit
-            if random.random() < 0.15 and consecutive_trees < 2:
+            if self.rng.random() < 0.15 and consecutive_trees < 2:
                 # Calculate X based on column index
                 x = i * (SCREEN_WIDTH / COLUMNS) # Align to grid
                 self.entities.append(Obstacle(x, self.y))
@@ -74,90 +95,89 @@ class GrassLane(Lane):
                 consecutive_trees = 0
 
 class RoadLane(Lane):
-    def __init__(self, y_pos, index, speed=100, direction=1):
-        super().__init__(y_pos, index)
+    def __init__(self, y_pos, index, speed=100, direction=1, rng=random, store=None, pool=None):
+        super().__init__(y_pos, index, store, pool)
+        self.rng = rng
         self.type = 'road'
         self.direction = direction # 1 or -1
         self.speed = speed * direction
         self.min_interval = 3.0 # Increased from 1.5 to reduce density (50% less cars)
         self.spawn_interval = 2.0 # Variable
         # Randomize start to prevent "wall of cars" when multiple lanes spawn at once
-        self.spawn_timer = random.uniform(0, self.min_interval)
+        self.spawn_timer = self.rng.uniform(0, self.min_interval) # Delay until the next spawn
         
         # Difficulty scaling could happen here
         
-    def update(self, dt):
-        super().update(dt)
-        self.spawn_timer -= dt
-        if self.spawn_timer <= 0:
-            self.spawn_vehicle()
-            self.spawn_timer = random.uniform(self.min_interval, self.min_interval * 2)
+    def initial_event(self):
+        return self.spawn_timer, 'spawn'
+        
+    def fire(self, event):
+        self.spawn_vehicle()
+        self.spawn_timer = self.rng.uniform(self.min_interval, self.min_interval * 2)
+        return self.spawn_timer, 'spawn'
             
     def spawn_vehicle(self):
         width = TILE_SIZE * 1.5
         start_x = -width if self.direction == 1 else SCREEN_WIDTH
-        v = Vehicle(start_x, self.y, width, self.speed)
-        self.entities.append(v)
+        self.spawn(Vehicle, start_x, self.y, width, self.speed)
 
 class RiverLane(Lane):
-    def __init__(self, y_pos, index, speed=80, direction=-1):
-        super().__init__(y_pos, index)
+    def __init__(self, y_pos, index, speed=80, direction=-1, rng=random, store=None, pool=None):
+        super().__init__(y_pos, index, store, pool)
+        self.rng = rng
         self.type = 'river'
         self.direction = direction
         self.speed = speed * direction
-        self.spawn_timer = random.uniform(0, 2.0)
+        self.spawn_timer = self.rng.uniform(0, 2.0) # Delay until the next spawn
         self.spawn_interval = 2.0
         
-    def update(self, dt):
-        super().update(dt)
-        self.spawn_timer -= dt
-        if self.spawn_timer <= 0:
-            self.spawn_log()
-            self.spawn_timer = random.uniform(1.5, 3.0)
+    def initial_event(self):
+        return self.spawn_timer, 'spawn'
+        
+    def fire(self, event):
+        self.spawn_log()
+        self.spawn_timer = self.rng.uniform(1.5, 3.0)
+        return self.spawn_timer, 'spawn'
             
     def spawn_log(self):
-        size_mult = random.choice([2, 3, 4])
+        size_mult = self.rng.choice([2, 3, 4])
         width = TILE_SIZE * size_mult
         start_x = -width if self.direction == 1 else SCREEN_WIDTH
-        l = Log(start_x, self.y, width, self.speed)
-        self.entities.append(l)
+        self.spawn(Log, start_x, self.y, width, self.speed)
 
 class RailLane(Lane):
-    def __init__(self, y_pos, index):
-        super().__init__(y_pos, index)
+    def __init__(self, y_pos, index, rng=random, store=None, pool=None):
+        super().__init__(y_pos, index, store, pool)
+        self.rng = rng
         self.type = 'rail'
-        self.train_timer = random.uniform(5, 10)
+        self.train_timer = self.rng.uniform(5, 10) # Delay until the warning
         self.train_active = False # Warning state
         self.train_passing = False
         self.warning_duration = 2.0
-        self.warning_timer = 0
-        
-    def update(self, dt):
-        super().update(dt)
-        
-        if not self.train_active and not self.train_passing:
-            self.train_timer -= dt
-            if self.train_timer <= 0:
-                self.train_active = True
-                self.warning_timer = self.warning_duration
-                # Play warning sound
-        
-        elif self.train_active:
-            self.warning_timer -= dt
-            if self.warning_timer <= 0:
-                self.train_active = False
-                self.spawn_train()
+        
+    def initial_event(self):
+        return self.train_timer, 'warning'
+        
+    def fire(self, event):
+        if event == 'warning':
+            self.train_active = True
+            # Play warning sound
+            return self.warning_duration, 'depart'
+        
+        self.train_active = False
+        self.spawn_train()
+        return None # One train per crossing
 
     def spawn_train(self):
         self.train_passing = True
-        direction = random.choice([-1, 1])
+        direction = self.rng.choice([-1, 1])
         speed = 800 * direction
         width = TILE_SIZE * 15
         start_x = -width if direction == 1 else SCREEN_WIDTH
-        t = Train(start_x, self.y, speed)
-        self.entities.append(t)
+        self.spawn(Train, start_x, self.y, speed)
         
     def render_background(self, surface, camera):
+        import pygame
         super().render_background(surface, camera)
         screen_y = camera.apply(self.y)
         if self.train_active:
@@ -0,0 +1,72 @@
+import math
+from config import *
+
+class LaneRing:
+    """
+    Lanes stored by row number in a power-of-two ring buffer.
+    Row r is the lane at y = -r * TILE_SIZE (rows grow as the world scrolls forward),
+    so finding the lane under a y coordinate is one division, and generating / culling
+    only touches the two ends.
+    """
+    def __init__(self, capacity=64):
+        capacity = 1 << max(0, capacity - 1).bit_length()
+        self.slots = [None] * capacity
+        self.mask = capacity - 1
+        self.first = 0 # Row of the oldest (bottom) lane
+        self.end = 0 # One past the newest (top) row
+
+    def __len__(self):
+        return self.end - self.first
+
+    def __iter__(self):
+        # Bottom to top, same order the lanes were generated in
+        slots, mask = self.slots, self.mask
+        for row in range(self.first, self.end):
+            yield slots[row & mask]
+
+    def append(self, lane):
+        if not len(self):
+            self.first = self.end = lane.index
+        if lane.index != self.end:
+            raise ValueError(f"Lane row {lane.index} appended after row {self.end - 1}")
+        if len(self) == len(self.slots):
+            self._grow()
+        self.slots[self.end & self.mask] = lane
+        self.end += 1
+
+    def _grow(self):
+        lanes = list(self)
+        self.slots = [None] * (len(self.slots) * 2)
+        self.mask = len(self.slots) - 1
+        for row, lane in enumerate(lanes, self.first):
+            self.slots[row & self.mask] = lane
+
+    def peek_oldest(self):
+        if not len(self):
+            return None
+        return self.slots[self.first & self.mask]
+
+    def pop_oldest(self):
+        lane = self.slots[self.first & self.mask]
+        self.slots[self.first & self.mask] = None
+        self.first += 1
+        return lane
+
+    def get(self, row):
+        if self.first <= row < self.end:
+            return self.slots[row & self.mask]
+        return None
+
+    def lane_at(self, y):
+        """Lane whose band [lane.y, lane.y + TILE_SIZE) contains world y, or None."""
+        return self.get(-math.floor(y / TILE_SIZE))
+
+    def lanes_in(self, y_min, y_max):
+        """Lanes with y_min < lane.y < y_max, bottom to top."""
+        lo = max(self.first, math.floor(-y_max / TILE_SIZE))
+        hi = min(self.end, math.ceil(-y_min / TILE_SIZE) + 1)
+        slots, mask = self.slots, self.mask
+        for row in range(lo, hi):
+            lane = slots[row & mask]
+            if y_min < lane.y < y_max:
+                yield lane
@@ -1,6 +1,10 @@
 
+import time
+LAUNCH_TIME = time.perf_counter() # Before pygame and the game modules are imported
+
 from game import Game
+IMPORT_MS = (time.perf_counter() - LAUNCH_TIME) * 1000.0
 
 if __name__ == "__main__":
-    game = Game()
+    game = Game(launch_time=LAUNCH_TIME, import_ms=IMPORT_MS)
     game.run()
@@ -1,5 +1,4 @@
 
-import pygame
 from config import *
 from entity import Entity
 
@@ -75,11 +74,15 @@ class Player(Entity):
                 self.x = self.target_x
                 self.y = self.target_y
                 self.z = 0
-        
-        # Update bounding box
-        self.rect = pygame.Rect(self.x + 5, self.y + 5, self.width, self.height)
+
+    @property
+    def rect(self):
+        # Bounding box, built on demand instead of every tick
+        import pygame
+        return pygame.Rect(self.x + 5, self.y + 5, self.width, self.height)
 
     def render(self, surface, camera, asset_manager):
+        import pygame
         screen_y = camera.apply(self.y)
         
         # Shadow
@@ -0,0 +1,121 @@
+import csv
+import time
+from collections import deque
+import pygame
+from config import *
+
+# Stages of one Game.run frame, in the order they happen
+PROFILE_STAGES = ('input', 'player', 'world', 'collisions', 'lanes', 'sort', 'entities', 'rotate', 'upscale', 'ui', 'overlay', 'present')
+
+class FrameProfiler:
+    """
+    Per-stage frame timing. Instrumented code calls `lap(stage)` after each stage;
+    the time since the previous lap is charged to that stage.
+    Keeps a rolling window for the on-screen overlay and can stream every frame to a CSV.
+    """
+    def __init__(self, enabled=PROFILE_ENABLED, csv_path=PROFILE_CSV, window=120):
+        self.enabled = enabled
+        self.csv_path = csv_path
+        self.csv_file = None
+        self.csv_writer = None
+        self.frame_index = 0
+
+        self.current = dict.fromkeys(PROFILE_STAGES, 0.0)
+        self.mark = 0.0
+        self.frame_start = 0.0
+
+        # Rolling window with running sums, so the overlay average is O(stages) per frame
+        self.window = window
+        self.history = deque()
+        self.sums = dict.fromkeys(PROFILE_STAGES, 0.0)
+        self.total_sum = 0.0
+        self.lanes = 0
+        self.entities = 0
+        self.quality = '' # Name of the quality tier in use
+        self.font = None
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.history.clear()
+        self.sums = dict.fromkeys(PROFILE_STAGES, 0.0)
+        self.total_sum = 0.0
+
+    def begin_frame(self):
+        for stage in self.current:
+            self.current[stage] = 0.0
+        self.frame_start = self.mark = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.current[stage] += (now - self.mark) * 1000.0
+        self.mark = now
+
+    def end_frame(self, lanes=0, entities=0, quality=''):
+        total = (time.perf_counter() - self.frame_start) * 1000.0
+        self.lanes = lanes
+        self.entities = entities
+        self.quality = quality
+
+        row = dict(self.current)
+        self.history.append((total, row))
+        self.total_sum += total
+        for stage, ms in row.items():
+            self.sums[stage] += ms
+        if len(self.history) > self.window:
+            old_total, old_row = self.history.popleft()
+            self.total_sum -= old_total
+            for stage, ms in old_row.items():
+                self.sums[stage] -= ms
+
+        if self.csv_path:
+            self.write_csv(total, row)
+        self.frame_index += 1
+
+    def write_csv(self, total, row):
+        if self.csv_writer is None:
+            self.csv_file = open(self.csv_path, 'w', newline='')
+            self.csv_writer = csv.writer(self.csv_file)
+            self.csv_writer.writerow(['frame', 'total_ms', *[f'{s}_ms' for s in PROFILE_STAGES], 'lanes', 'entities', 'quality'])
+        self.csv_writer.writerow([self.frame_index, f'{total:.4f}', *[f'{row[s]:.4f}' for s in PROFILE_STAGES],
+                                  self.lanes, self.entities, self.quality])
+        if self.frame_index % self.window == 0:
+            self.csv_file.flush() # Keep the file useful if the game is killed
+
+    def averages(self):
+        n = len(self.history) or 1
+        return self.total_sum / n, {stage: ms / n for stage, ms in self.sums.items()}
+
+    def render_overlay(self, surface):
+        if self.font is None:
+            self.font = pygame.font.Font(None, 18) # Default font: no system font scan
+        total, stages = self.averages()
+        budget = 1000.0 / FPS
+
+        line_h = 16
+        bar_w = 120
+        panel = pygame.Rect(SCREEN_WIDTH - 250, 110, 240, line_h * (len(PROFILE_STAGES) + 3) + 8)
+        pygame.draw.rect(surface, (0, 0, 0), panel)
+
+        x = panel.x + 6
+        y = panel.y + 4
+        head = f"{total:5.2f} ms  lanes {self.lanes}  ents {self.entities}"
+        surface.blit(self.font.render(head, True, (255, 255, 255)), (x, y))
+        y += line_h
+        for stage in PROFILE_STAGES:
+            ms = stages[stage]
+            surface.blit(self.font.render(f"{stage:<10} {ms:5.2f}", True, (220, 220, 220)), (x, y))
+            # Bar scaled to the frame budget; red once a single stage eats a quarter of it
+            width = min(bar_w, int(bar_w * ms / budget))
+            color = (255, 80, 80) if ms > budget / 4 else (80, 220, 120)
+            pygame.draw.rect(surface, color, (panel.right - bar_w - 6, y + 3, max(1, width), line_h - 6))
+            y += line_h
+        surface.blit(self.font.render(f"budget {budget:.1f} ms ({FPS} fps)", True, (180, 180, 180)), (x, y))
+        y += line_h
+        surface.blit(self.font.render(f"quality {self.quality}", True, (180, 180, 180)), (x, y))
+        return panel
+
+    def close(self):
+        if self.csv_file is not None:
+            self.csv_file.close()
+            self.csv_file = None
+            self.csv_writer = None
@@ -0,0 +1,86 @@
+from collections import deque
+from config import *
+
+class QualityTier:
+    """What WorldRenderer draws at one quality level (see WorldRenderer.set_quality)."""
+    def __init__(self, name, shadows, lane_details, scale, tilt):
+        self.name = name
+        self.shadows = shadows # Entity and tree shadows
+        self.lane_details = lane_details # Road markings, rail ties and rails
+        self.scale = scale # Internal resolution of the world pass
+        self.tilt = tilt # False draws the world flat, skipping the rotation
+
+# Best first; each tier drops one more thing
+QUALITY_TIERS = (
+    QualityTier('full', True, True, RENDER_SCALE, True),
+    QualityTier('no_shadows', False, True, RENDER_SCALE, True),
+    QualityTier('simple_lanes', False, False, RENDER_SCALE, True),
+    QualityTier('low_res', False, False, min(RENDER_SCALE, 0.5), True),
+    QualityTier('flat', False, False, min(RENDER_SCALE, 0.5), False),
+)
+
+class QualityGovernor:
+    """
+    Picks a quality tier from measured frame times. Steps down one tier as soon as a full
+    window averages over the budget, and up one only after `recover_frames` frames in a row
+    under `headroom` of it. Each tier change starts a fresh window. Stepping up and then
+    straight back down doubles the wait before the next step up.
+    """
+    def __init__(self, budget_ms=QUALITY_BUDGET_MS, window=QUALITY_WINDOW, headroom=QUALITY_HEADROOM,
+                 recover_frames=QUALITY_RECOVER_FRAMES, mode=QUALITY_MODE):
+        self.budget_ms = budget_ms
+        self.window = window
+        self.headroom = headroom
+        self.base_recover = recover_frames
+        self.recover_frames = recover_frames
+        self.adaptive = mode == 'auto'
+        self.tier = 0 if self.adaptive else min(max(int(mode), 0), len(QUALITY_TIERS) - 1)
+
+        self.samples = deque()
+        self.total = 0.0 # Running sum of `samples`
+        self.calm = 0 # Consecutive frames with headroom
+        self.frame = 0
+        self.raised_at = None # Frame of the last step up
+        self.changes = 0
+
+    @property
+    def current(self):
+        return QUALITY_TIERS[self.tier]
+
+    def update(self, frame_ms):
+        """Feed one frame's work time (ms). Returns True when the tier changed."""
+        self.frame += 1
+        if not self.adaptive:
+            return False
+        self.samples.append(frame_ms)
+        self.total += frame_ms
+        if len(self.samples) > self.window:
+            self.total -= self.samples.popleft()
+        elif len(self.samples) < self.window:
+            return False
+
+        mean = self.total / self.window
+        if mean > self.budget_ms:
+            if self.tier == len(QUALITY_TIERS) - 1:
+                return False
+            if self.raised_at is not None and self.frame - self.raised_at <= 2 * self.window:
+                # The step up did not hold: wait longer before trying again
+                self.recover_frames = min(self.recover_frames * 2, self.base_recover * 8)
+            return self.set_tier(self.tier + 1)
+
+        if mean < self.budget_ms * self.headroom:
+            self.calm += 1
+            if self.calm >= self.recover_frames and self.tier > 0:
+                self.raised_at = self.frame
+                return self.set_tier(self.tier - 1)
+        else:
+            self.calm = 0
+        return False
+
+    def set_tier(self, tier):
+        self.tier = tier
+        self.samples.clear()
+        self.total = 0.0
+        self.calm = 0
+        self.changes += 1
+        return True
@@ -0,0 +1,491 @@
+import math
+import pygame
+from config import *
+
+class TiltTransform:
+    """
+    Affine map from world-buffer coordinates to screen coordinates for a fixed tilt.
+    Matches `pygame.transform.rotate(buffer, angle)` blitted centered on the screen.
+    With `scale`, maps onto a target that is `scale` times the screen size instead.
+    """
+    def __init__(self, angle, buffer_size, screen_size, scale=1.0):
+        rad = math.radians(angle)
+        self.cos = math.cos(rad)
+        self.sin = math.sin(rad)
+        self.center_x = buffer_size[0] / 2
+        self.center_y = buffer_size[1] / 2
+
+        # Size of the rotated buffer, as pygame computes it (done once)
+        rotated_rect = pygame.transform.rotate(pygame.Surface(buffer_size), angle).get_rect(
+            center=(screen_size[0] / 2, screen_size[1] / 2))
+        self.origin_x = rotated_rect.x + rotated_rect.width / 2
+        self.origin_y = rotated_rect.y + rotated_rect.height / 2
+        self.scale = scale
+
+    def apply(self, x, y):
+        dx = x - self.center_x
+        dy = y - self.center_y
+        return ((dx * self.cos + dy * self.sin + self.origin_x) * self.scale,
+                (-dx * self.sin + dy * self.cos + self.origin_y) * self.scale)
+
+    def offset(self, dx, dy):
+        # Screen displacement of a buffer-space displacement (the linear part of apply)
+        return ((dx * self.cos + dy * self.sin) * self.scale,
+                (-dx * self.sin + dy * self.cos) * self.scale)
+
+
+class StaticLayer:
+    """
+    A lane's static obstacles (trees) with their shadows, pre-rendered once.
+    Sorted with the moving entities as a single item, so depth ordering is unchanged.
+    """
+    def __init__(self, lane, flat, rotated, x, top, count):
+        self.lane = lane
+        self.y = lane.y
+        self.height = TILE_SIZE
+        self.flat = flat # Buffer-space overlay at full resolution
+        self.scaled = None # `flat` at the renderer's internal resolution ('rotate' path)
+        self.scale = None # Resolution `scaled` and `rotated` were built for
+        self.rotated = rotated # Pre-tilted `scaled` ('affine' path)
+        self.x = x # Top-left of `flat` relative to the lane's buffer position
+        self.top = top
+        self.count = count # Obstacles baked in; any other lane entity still moves
+
+
+class WorldRenderer:
+    """
+    Draws lanes, entities and the player with the 3D tilt effect.
+    Two paths, selected by RENDER_PATH:
+      'rotate' - draw into a persistent oversized buffer, rotate the whole buffer every frame.
+      'affine' - pre-rotated lane strips and sprites, placed directly on the screen via TiltTransform.
+    Either path can draw at a reduced internal resolution (RENDER_SCALE), upscaled once at the end.
+    set_quality() trades detail for speed (see quality.py).
+    """
+    def __init__(self, asset_manager, path=RENDER_PATH, scale=RENDER_SCALE):
+        self.asset_manager = asset_manager
+        self.path = path
+
+        # Buffer size needs to be larger to accommodate rotation without clipping corners
+        self.buffer_width = SCREEN_WIDTH + 400
+        self.buffer_height = SCREEN_HEIGHT + 400
+        # We need to offset rendering by (buffer_width - SCREEN_WIDTH)/2 to center it on the buffer
+        self.offset_x = 200
+        self.offset_y = 200
+
+        self.world_surf = None # Persistent buffer for the 'rotate' path
+        self.scaled_surf = None # Reduced-resolution world target, when scale < 1
+        self.strip_cache = {} # Lane strips by (style, tilted, scale, details)
+        self.static_layers = {} # Row -> StaticLayer of the lanes currently in view
+        # (image key, flipped, width, height) -> surfaces and anchor offsets, per drawing mode
+        self.flat_sprites = {}
+        self.tilted_sprites = {}
+        self.profiler = None # Optional FrameProfiler
+        self.shadows = True
+        self.lane_details = True
+        self.tilt_enabled = True
+        self.scale = None
+        self.set_scale(scale)
+
+    def set_quality(self, tier):
+        """Apply a quality.QualityTier: shadows, lane details, internal resolution and tilt."""
+        if tier.shadows != self.shadows:
+            self.static_layers = {} # Tree shadows are baked into the overlays
+        self.shadows = tier.shadows
+        self.flat_sprites.clear()
+        self.tilted_sprites.clear()
+        self.lane_details = tier.lane_details
+        self.tilt_enabled = tier.tilt
+        self.set_scale(tier.scale)
+
+    def set_scale(self, scale):
+        """Internal resolution of the world pass, as a fraction of the screen size."""
+        if scale == self.scale:
+            return
+        self.scale = scale
+        self.tilt = TiltTransform(TILT_ANGLE, (self.buffer_width, self.buffer_height), (SCREEN_WIDTH, SCREEN_HEIGHT), scale)
+        self.world_surf = None
+        self.scaled_surf = None
+        self.flat_sprites.clear()
+        self.tilted_sprites.clear()
+
+    def render(self, surface, lanes, player, camera):
+        target = surface
+        if self.scale != 1.0:
+            if self.scaled_surf is None:
+                self.scaled_surf = pygame.Surface((round(SCREEN_WIDTH * self.scale), round(SCREEN_HEIGHT * self.scale)))
+            target = self.scaled_surf
+
+        if self.path == 'rotate' or not self.tilt_enabled:
+            self.render_rotate(target, lanes, player, camera)
+        else:
+            self.render_affine(target, lanes, player, camera)
+
+        if target is not surface:
+            # One upscale for the whole world pass; the UI then draws on top at native resolution
+            if RENDER_SMOOTH:
+                pygame.transform.smoothscale(target, surface.get_size(), surface)
+            else:
+                pygame.transform.scale(target, surface.get_size(), surface)
+            if self.profiler: self.profiler.lap('upscale')
+
+    # --- Shared helpers ---
+
+    def lane_style(self, lane):
+        if lane.type == 'grass' and lane.index % 2 == 0:
+            return 'grass_light'
+        return lane.type
+
+    def draw_lane(self, surface, style, screen_y, width, details=True):
+        color = COLOR_GRASS
+        if style == 'road': color = COLOR_ROAD
+        elif style == 'river': color = COLOR_RIVER
+        elif style == 'rail': color = COLOR_RAIL
+        elif style == 'grass_light': color = COLOR_GRASS_LIGHT
+
+        rect = pygame.Rect(0, screen_y, width, TILE_SIZE)
+        pygame.draw.rect(surface, color, rect)
+
+        # Details
+        if not details:
+            return
+        if style == 'road':
+            pygame.draw.line(surface, COLOR_ROAD_MARKING, (0, screen_y + TILE_SIZE - 2), (width, screen_y + TILE_SIZE - 2), 2)
+        elif style == 'rail':
+            for i in range(0, width, 20):
+                pygame.draw.rect(surface, COLOR_RAIL_METAL, (i, screen_y + 2, 4, TILE_SIZE - 4))
+            pygame.draw.line(surface, COLOR_RAIL_METAL, (0, screen_y + 10), (width, screen_y + 10), 4)
+            pygame.draw.line(surface, COLOR_RAIL_METAL, (0, screen_y + TILE_SIZE - 10), (width, screen_y + TILE_SIZE - 10), 4)
+
+    def scaled_size(self, surf):
+        # Size of `surf` at the internal resolution; None at full scale so lookups hit the original
+        if self.scale == 1.0:
+            return None
+        return (max(1, round(surf.get_width() * self.scale)), max(1, round(surf.get_height() * self.scale)))
+
+    def warning_color(self):
+        return (255,0,0) if int(pygame.time.get_ticks()/200)%2==0 else (100,0,0)
+
+    def visible_lanes(self, lanes, camera):
+        # Lanes whose buffer y falls in (-TILE_SIZE, buffer_height), bottom to top
+        top = camera.scroll_y - self.offset_y
+        return list(lanes.lanes_in(top - TILE_SIZE, top + self.buffer_height))
+
+    def gather(self, lanes, player):
+        render_list = [player]
+        for lane in lanes:
+            layer = self.static_layers.get(lane.index)
+            if layer is None:
+                render_list.extend(lane.entities)
+                continue
+            if layer.count:
+                render_list.append(layer)
+            if len(lane.entities) > layer.count:
+                render_list.extend(e for e in lane.entities if getattr(e, 'kind', None) is not None)
+        render_list.sort(key=lambda e: e.y + e.height + (20 if e is player else 0))
+        return render_list
+
+    def layout(self, key):
+        """
+        Full-size sprite and shadow for a sprite key, and their buffer-space offsets from the
+        entity's anchor (x + offset_x, screen_y). None when there is no sprite to draw.
+        """
+        image_key, flipped, width, height = key
+        img = self.asset_manager.get_variant(image_key, flipped) if image_key else None
+        if img is None:
+            return None
+        shadow = self.asset_manager.get_shadow(image_key, flipped)
+
+        dx = (width - img.get_width()) // 2
+        dy = height - img.get_height()
+
+        # Position: Bottom of entity + Offset
+        # We want it to look like light is from Top-Left, so shadow falls Bottom-Right
+        sh_dx = dx + 10 # Offset X
+        sh_dy = height - (shadow.get_height() // 2) + 5 # Offset Y (Ground level)
+        return img, shadow, dx, dy, sh_dx, sh_dy
+
+    def flat_sprite(self, key):
+        # (sprite, x, y, shadow or None, x, y) at the internal resolution, offsets scaled
+        laid = self.layout(key)
+        if laid is None:
+            return False
+        img, shadow, dx, dy, sh_dx, sh_dy = laid
+        image_key, flipped = key[:2]
+        size = self.scaled_size(img)
+        s = self.scale
+        s_surf = self.asset_manager.get_shadow(image_key, flipped, size) if self.shadows else None
+        return (self.asset_manager.get_variant(image_key, flipped, size), dx * s, dy * s, s_surf, sh_dx * s, sh_dy * s)
+
+    def tilted_sprite(self, key):
+        # As flat_sprite, but pre-rotated, with offsets from the tilted anchor to the blit position
+        laid = self.layout(key)
+        if laid is None:
+            return False
+        img, shadow, dx, dy, sh_dx, sh_dy = laid
+        image_key, flipped = key[:2]
+        size = self.scaled_size(img)
+        img_rot = self.asset_manager.get_variant(image_key, flipped, size, angle=TILT_ANGLE)
+        # Same placement as tilted_pos: the rotated image centred on the tilted sprite centre
+        ix, iy = self.tilt.offset(dx + img.get_width() / 2, dy + img.get_height() / 2)
+        entry = (img_rot, ix - img_rot.get_width() / 2, iy - img_rot.get_height() / 2, None, 0, 0)
+        if self.shadows:
+            s_rot = self.asset_manager.get_shadow(image_key, flipped, size, angle=TILT_ANGLE)
+            sx, sy = self.tilt.offset(sh_dx + shadow.get_width() / 2, sh_dy + shadow.get_height() / 2)
+            entry = entry[:3] + (s_rot, sx - s_rot.get_width() / 2, sy - s_rot.get_height() / 2)
+        return entry
+
+    def flush(self, surface, shadows, sprites):
+        # Draw and empty the queued layers: all shadows first, then the sprites in order
+        if shadows:
+            surface.blits(shadows, doreturn=False)
+            shadows.clear()
+        if sprites:
+            surface.blits(sprites, doreturn=False)
+            sprites.clear()
+
+    def update_static_layers(self, lanes, tilted):
+        # Keep layers only for lanes in view; a culled (or replaced) lane drops its layer
+        layers = {}
+        for lane in lanes:
+            layer = self.static_layers.get(lane.index)
+            if layer is None or layer.lane is not lane:
+                layer = self.build_static_layer(lane)
+            if layer.flat is not None and layer.scale != self.scale:
+                size = self.scaled_size(layer.flat)
+                layer.scaled = layer.flat if size is None else pygame.transform.scale(layer.flat, size)
+                layer.rotated = None # Re-tilted from the new `scaled`
+                layer.scale = self.scale
+            if tilted and layer.rotated is None and layer.flat is not None:
+                layer.rotated = pygame.transform.rotate(layer.scaled, TILT_ANGLE)
+                if pygame.display.get_surface() is not None:
+                    layer.rotated = layer.rotated.convert_alpha()
+                # Mostly empty: RLE lets the blit skip transparent runs
+                layer.rotated.set_alpha(255, pygame.RLEACCEL)
+            layers[lane.index] = layer
+        self.static_layers = layers
+
+    def build_static_layer(self, lane):
+        # Shadows and sprites placed as layout() does, relative to the lane's top-left
+        draws = []
+        count = 0
+        for e in lane.entities:
+            if getattr(e, 'kind', None) is not None or not e.image_key:
+                continue
+            img = self.asset_manager.get_variant(e.image_key)
+            if not img:
+                continue
+            shadow = self.asset_manager.get_shadow(e.image_key)
+            draw_x = e.x + self.offset_x + (e.width - img.get_width()) // 2
+            draw_y = e.y - lane.y + e.height - img.get_height()
+            sh_y = (e.y - lane.y + e.height) - (shadow.get_height() // 2) + 5
+            if self.shadows:
+                draws.append((shadow, draw_x + 10, sh_y))
+            draws.append((img, draw_x, draw_y))
+            count += 1
+        if not draws:
+            return StaticLayer(lane, None, None, 0, 0, 0)
+
+        left = min(x for _, x, _ in draws)
+        top = min(y for _, _, y in draws)
+        right = max(x + img.get_width() for img, x, _ in draws)
+        bottom = max(y + img.get_height() for img, _, y in draws)
+        flat = pygame.Surface((math.ceil(right - left), math.ceil(bottom - top)), pygame.SRCALPHA)
+        flat.blits([(img, (x - left, y - top)) for img, x, y in draws], doreturn=False)
+        return StaticLayer(lane, flat, None, left, top, count)
+
+    # --- 'rotate' path ---
+
+    def render_rotate(self, surface, lanes, player, camera):
+        # We render the entire game world onto a buffer first.
+        # Then we rotate that buffer and blit it to the main screen.
+        # Positions stay in full-size buffer space and are multiplied by the scale when drawn.
+        s = self.scale
+        if self.world_surf is None:
+            self.world_surf = pygame.Surface((round(self.buffer_width * s), round(self.buffer_height * s)))
+        world_surf = self.world_surf
+        ox = oy = 0 # Where the buffer's top-left lands on `world_surf`
+        if not self.tilt_enabled:
+            # Lowest quality tier: nothing to rotate, so draw flat straight onto the target,
+            # with the buffer's centre on the screen's centre
+            ox = (surface.get_width() - world_surf.get_width()) // 2
+            oy = (surface.get_height() - world_surf.get_height()) // 2
+            world_surf = surface
+        world_surf.fill(COLOR_BG)
+        lanes = self.visible_lanes(lanes, camera)
+        self.update_static_layers(lanes, tilted=False)
+
+        # 1. Backgrounds of all lanes, in one blits() call
+        strips = []
+        warnings = []
+        for lane in lanes:
+            screen_y = camera.apply(lane.y) + self.offset_y
+            # Note: We draw WIDER than screen width on the buffer to fill corners after rotation
+            if -TILE_SIZE < screen_y < self.buffer_height:
+                strips.append((self.get_strip(self.lane_style(lane), tilted=False), (ox, screen_y * s + oy)))
+                if getattr(lane, 'train_active', False):
+                    warnings.append(((50 + self.offset_x) * s + ox, (screen_y + 5) * s + oy))
+        world_surf.blits(strips, doreturn=False)
+        for center in warnings:
+            pygame.draw.circle(world_surf, self.warning_color(), center, max(1, round(5 * s)))
+
+        profiler = self.profiler
+        if profiler: profiler.lap('lanes')
+
+        # 2. Entities, back to front: shadows as one layer, then sprites
+        render_list = self.gather(lanes, player)
+        if profiler: profiler.lap('sort')
+        table = self.flat_sprites
+        shadows = []
+        sprites = []
+        for entity in render_list:
+            screen_y = camera.apply(entity.y) + self.offset_y
+            # Draw only if on buffer screen
+            if not -entity.height < screen_y < self.buffer_height:
+                continue
+
+            if type(entity) is StaticLayer:
+                sprites.append((entity.scaled, (entity.x * s + ox, (screen_y + entity.top) * s + oy)))
+                continue
+
+            # Flip if moving left (negative speed)
+            # We assume sprites face RIGHT by default
+            key = (entity.image_key, getattr(entity, 'speed', 0) < 0, entity.width, entity.height)
+            sprite = table.get(key)
+            if sprite is None:
+                sprite = table[key] = self.flat_sprite(key)
+
+            x = (entity.x + self.offset_x) * s + ox
+            y = screen_y * s + oy
+            z = entity.z * s if entity is player else 0
+            if sprite:
+                img, dx, dy, shadow, sh_dx, sh_dy = sprite
+                if shadow is not None:
+                    shadows.append((shadow, (x + sh_dx, y + sh_dy)))
+                sprites.append((img, (x + dx, y + dy - z)))
+            else:
+                # No sprite: flush what is queued so the rect keeps its place in the order
+                self.flush(world_surf, shadows, sprites)
+                pygame.draw.rect(world_surf, entity.color, pygame.Rect(x, y - z, entity.width * s, entity.height * s))
+        self.flush(world_surf, shadows, sprites)
+
+        if profiler: profiler.lap('entities')
+
+        if self.tilt_enabled:
+            # TRANSFORM: Pygame can't do real 3D, so fake the Crossy Road camera
+            # by rotating the whole buffer around the screen Z-axis.
+            rotated_surf = pygame.transform.rotate(world_surf, TILT_ANGLE) # 15 degrees clockwise
+
+            # Center the rotated surface on the main screen
+            r_rect = rotated_surf.get_rect(center=(surface.get_width()/2, surface.get_height()/2))
+
+            surface.fill(COLOR_BG) # Clear margins
+            surface.blit(rotated_surf, r_rect)
+        if profiler: profiler.lap('rotate')
+
+    # --- 'affine' path ---
+
+    def get_strip(self, style, tilted=True):
+        # One full-width lane strip per style and internal resolution, drawn (and rotated) once.
+        key = (style, tilted, self.scale, self.lane_details)
+        strip = self.strip_cache.get(key)
+        if strip is None:
+            if not tilted:
+                strip = pygame.Surface((self.buffer_width, TILE_SIZE))
+                self.draw_lane(strip, style, 0, self.buffer_width, self.lane_details)
+                if self.scale != 1.0:
+                    strip = pygame.transform.scale(strip, self.scaled_size(strip))
+                self.strip_cache[key] = strip
+                return strip
+
+            # 1px (at the internal resolution) taller than a lane so neighbouring strips leave no seams after rotation.
+            pad = self.strip_pad()
+            flat = pygame.Surface((self.buffer_width, TILE_SIZE + pad))
+            flat.fill(COLOR_STRIP_KEY)
+            self.draw_lane(flat, style, 0, self.buffer_width, self.lane_details)
+            pygame.draw.rect(flat, flat.get_at((0, TILE_SIZE - 1)), (0, TILE_SIZE, self.buffer_width, pad))
+            if self.scale != 1.0:
+                flat = pygame.transform.scale(flat, self.scaled_size(flat)) # Nearest: no blending into the key
+            flat.set_colorkey(COLOR_STRIP_KEY)
+
+            strip = pygame.transform.rotate(flat, TILT_ANGLE)
+            # Rotation pads with the colorkey; RLE makes the padding free to blit
+            strip.set_colorkey(COLOR_STRIP_KEY, pygame.RLEACCEL)
+            if pygame.display.get_surface() is not None:
+                strip = strip.convert()
+            self.strip_cache[key] = strip
+        return strip
+
+    def strip_pad(self):
+        return math.ceil(1 / self.scale)
+
+    def tilted_pos(self, img, x, y, w, h):
+        # Where a pre-rotated image whose unrotated top-left was (x, y) in buffer space lands.
+        # (w, h) is its unrotated full-resolution size; `img` may be at the internal resolution.
+        cx, cy = self.tilt.apply(x + w / 2, y + h / 2)
+        return round(cx - img.get_width() / 2), round(cy - img.get_height() / 2)
+
+    def render_affine(self, surface, lanes, player, camera):
+        surface.fill(COLOR_BG)
+        lanes = self.visible_lanes(lanes, camera)
+        self.update_static_layers(lanes, tilted=True)
+
+        # 1. Lane strips, in one blits() call
+        strips = []
+        warnings = []
+        pad = self.strip_pad()
+        for lane in lanes:
+            screen_y = camera.apply(lane.y) + self.offset_y
+            if -TILE_SIZE < screen_y < self.buffer_height:
+                strip = self.get_strip(self.lane_style(lane))
+                strips.append((strip, self.tilted_pos(strip, 0, screen_y, self.buffer_width, TILE_SIZE + pad)))
+                if getattr(lane, 'train_active', False):
+                    warnings.append(self.tilt.apply(50 + self.offset_x, screen_y + 5))
+        surface.blits(strips, doreturn=False)
+        for center in warnings:
+            pygame.draw.circle(surface, self.warning_color(), center, max(1, round(5 * self.scale)))
+
+        profiler = self.profiler
+        if profiler: profiler.lap('lanes')
+
+        # 2. Entities, back to front: shadows as one layer, then sprites
+        render_list = self.gather(lanes, player)
+        if profiler: profiler.lap('sort')
+        table = self.tilted_sprites
+        shadows = []
+        sprites = []
+        for entity in render_list:
+            screen_y = camera.apply(entity.y) + self.offset_y
+            if not -entity.height < screen_y < self.buffer_height:
+                continue
+
+            if type(entity) is StaticLayer:
+                sprites.append((entity.rotated, self.tilted_pos(entity.rotated, entity.x, screen_y + entity.top,
+                                                                entity.flat.get_width(), entity.flat.get_height())))
+                continue
+
+            key = (entity.image_key, getattr(entity, 'speed', 0) < 0, entity.width, entity.height)
+            sprite = table.get(key)
+            if sprite is None:
+                sprite = table[key] = self.tilted_sprite(key)
+
+            z = entity.z if entity is player else 0
+            if sprite:
+                # Everything is placed relative to the entity's tilted anchor
+                ax, ay = self.tilt.apply(entity.x + self.offset_x, screen_y)
+                img, dx, dy, shadow, sh_dx, sh_dy = sprite
+                if shadow is not None:
+                    shadows.append((shadow, (round(ax + sh_dx), round(ay + sh_dy))))
+                if z:
+                    zx, zy = self.tilt.offset(0, -z)
+                    ax += zx
+                    ay += zy
+                sprites.append((img, (round(ax + dx), round(ay + dy))))
+            else:
+                self.flush(surface, shadows, sprites)
+                x = entity.x + self.offset_x
+                y = screen_y - z
+                corners = [(x, y), (x + entity.width, y), (x + entity.width, y + entity.height), (x, y + entity.height)]
+                pygame.draw.polygon(surface, entity.color, [self.tilt.apply(cx, cy) for cx, cy in corners])
+        self.flush(surface, shadows, sprites)
+
+        if profiler: profiler.lap('entities')
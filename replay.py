@@ -0,0 +1,146 @@
+"""
+Input replays: a run's seed plus the ticks on which an action was fed to the Simulation.
+Variable-timestep runs also keep every tick's dt. Playback goes through the same
+Simulation.step as the game, so it reproduces the run exactly.
+
+    CROSSY_RECORD=run.crp python main.py        # record each run to run-001.crp, run-002.crp, ...
+    CROSSY_REPLAY=run.crp python main.py        # watch a recording in the game window
+    python replay.py run.crp                    # headless playback as fast as possible
+    python replay.py run.crp --render-every 30 --frames out/   # also save every 30th frame
+"""
+import os
+import time
+import struct
+import argparse
+from array import array
+from config import *
+from simulation import Simulation, MOVE_ACTIONS
+
+MAGIC = b'CRRP'
+VERSION = 1
+HEADER = struct.Struct('<4sHqdBII') # magic, version, seed, dt, fixed timestep, ticks, events
+ACTION_CODES = (None,) + MOVE_ACTIONS
+
+class Replay:
+    """Seed and sparse (tick, action) input log of one run."""
+    def __init__(self, seed, dt=SIM_DT, fixed=True):
+        self.seed = seed
+        self.dt = dt # Every tick's dt when `fixed`
+        self.fixed = fixed
+        self.ticks = 0
+        self.event_ticks = array('I')
+        self.event_actions = bytearray() # Index into ACTION_CODES
+        self.dts = array('d') # Per-tick dt, variable timestep only
+
+    def record(self, action, dt):
+        # Called once per Simulation.step with exactly what was passed to it
+        if action is not None:
+            self.event_ticks.append(self.ticks)
+            self.event_actions.append(ACTION_CODES.index(action))
+        if not self.fixed:
+            self.dts.append(dt)
+        self.ticks += 1
+
+    def steps(self):
+        """(action, dt) for every recorded tick."""
+        events = iter(zip(self.event_ticks, self.event_actions))
+        upcoming = next(events, None)
+        for tick in range(self.ticks):
+            action = None
+            if upcoming is not None and upcoming[0] == tick:
+                action = ACTION_CODES[upcoming[1]]
+                upcoming = next(events, None)
+            yield action, self.dt if self.fixed else self.dts[tick]
+
+    def dumps(self):
+        return b''.join([HEADER.pack(MAGIC, VERSION, self.seed, self.dt, self.fixed, self.ticks, len(self.event_ticks)),
+                         self.event_ticks.tobytes(), bytes(self.event_actions), self.dts.tobytes()])
+
+    @classmethod
+    def loads(cls, data):
+        magic, version, seed, dt, fixed, ticks, events = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a version {VERSION} replay")
+        replay = cls(seed, dt, bool(fixed))
+        replay.ticks = ticks
+        offset = HEADER.size
+        replay.event_ticks.frombytes(data[offset:offset + events * 4])
+        offset += events * 4
+        replay.event_actions = bytearray(data[offset:offset + events])
+        offset += events
+        if not replay.fixed:
+            replay.dts.frombytes(data[offset:offset + ticks * 8])
+        return replay
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.dumps())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.loads(f.read())
+
+
+def numbered_path(path):
+    """First free `<stem>-NNN<ext>` for `path`, so each recorded run gets its own file."""
+    stem, ext = os.path.splitext(path)
+    n = 1
+    while os.path.exists(f"{stem}-{n:03d}{ext}"):
+        n += 1
+    return f"{stem}-{n:03d}{ext}"
+
+def play(replay, render_every=0, frames_dir=None):
+    """
+    Run a replay headless. With `render_every`, every Nth tick is also drawn
+    (SDL dummy driver) and saved to `frames_dir` if given.
+    Returns the finished Simulation and the wall time spent stepping and drawing.
+    """
+    sim = Simulation(replay.seed)
+    draw = None
+    if render_every:
+        draw = _frame_drawer(sim, frames_dir)
+
+    start = time.perf_counter()
+    for action, dt in replay.steps():
+        sim.step(dt, action)
+        if draw and sim.ticks % render_every == 0:
+            draw(sim.ticks)
+    return sim, time.perf_counter() - start
+
+def _frame_drawer(sim, frames_dir):
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    from asset_manager import AssetManager
+    from renderer import WorldRenderer
+    from ui import UIManager
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    assets = AssetManager.get_instance()
+    assets.load_assets()
+    renderer = WorldRenderer(assets)
+    ui = UIManager(assets)
+    if frames_dir:
+        os.makedirs(frames_dir, exist_ok=True)
+
+    def draw(tick):
+        renderer.render(screen, sim.get_lanes(), sim.player, sim.camera)
+        ui.render_game_ui(screen, sim.score, sim.high_score, sim.xp, sim.next_level_xp, sim.level)
+        if frames_dir:
+            pygame.image.save(screen, os.path.join(frames_dir, f"tick_{tick:06d}.png"))
+    return draw
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless replay playback")
+    parser.add_argument('replay')
+    parser.add_argument('--render-every', type=int, default=0, help="Also draw every Nth tick")
+    parser.add_argument('--frames', default=None, help="Directory for the drawn frames")
+    args = parser.parse_args()
+
+    replay = Replay.load(args.replay)
+    sim, elapsed = play(replay, args.render_every, args.frames)
+    rate = replay.ticks / elapsed if elapsed else 0.0
+    print(f"{replay.ticks} ticks in {elapsed * 1000:.1f} ms ({rate:.0f} ticks/s, "
+          f"{rate * SIM_DT:.0f}x real time)")
+    print(f"score {sim.score}, status {sim.status}, digest {sim.state_digest()}")
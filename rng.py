@@ -0,0 +1,32 @@
+MASK64 = (1 << 64) - 1
+
+class SplitMix64:
+    """
+    Small seeded PRNG for per-lane randomness. Its whole state is one 64-bit word,
+    so a lane's generator snapshots in 8 bytes (random.Random carries ~2.5 KB).
+    Implements the subset of the random.Random API lanes use.
+    """
+    __slots__ = ('state',)
+
+    def __init__(self, seed=0):
+        self.state = seed & MASK64
+
+    def next_u64(self):
+        self.state = (self.state + 0x9E3779B97F4A7C15) & MASK64
+        z = self.state
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+        return z ^ (z >> 31)
+
+    def random(self):
+        # 53 random bits -> float in [0, 1)
+        return (self.next_u64() >> 11) * (1.0 / (1 << 53))
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.random()
+
+    def randint(self, a, b):
+        return a + self.next_u64() % (b - a + 1)
+
+    def choice(self, seq):
+        return seq[self.next_u64() % len(seq)]
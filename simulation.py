@@ -0,0 +1,174 @@
+import random
+import struct
+import hashlib
+from contextlib import contextmanager
+from config import *
+from camera import Camera
+from player import Player
+from world_generator import WorldGenerator
+from collision_manager import CollisionManager
+
+# Hop actions a controller (keyboard, bot, test) can feed into Simulation.step, in priority order
+MOVE_ACTIONS = ('up', 'down', 'left', 'right')
+
+class Simulation:
+    """
+    The game world without any display, fonts or sprites.
+    Owns the Player, Camera, WorldGenerator and CollisionManager and is driven
+    programmatically: `step(dt, action)` advances one tick, `tick(action)` one fixed SIM_DT tick.
+    
+    With a seed, all randomness derives from one random.Random, so the same seed and the
+    same per-tick actions give bit-identical state at any wall-clock speed.
+    With `streaming`, world chunks are built on a background thread; the world is the same.
+    """
+    def __init__(self, seed=None, streaming=False):
+        self.seed = seed
+        self.streaming = streaming # Build world chunks on a background thread
+        self.world_generator = None
+        self.high_score = 0
+        self.profiler = None # Optional FrameProfiler; stages report with lap()
+        self.reset()
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.seed = seed
+        # seed=None -> a fresh seed each run; kept so the run can still be replayed
+        self.run_seed = self.seed if self.seed is not None else random.getrandbits(63)
+        self.rng = random.Random(self.run_seed)
+        
+        # Initialize Game World
+        self.player = Player(SCREEN_WIDTH // 2, 0)
+        self.camera = Camera()
+        if self.world_generator is not None:
+            self.world_generator.close()
+        self.world_generator = WorldGenerator(self.rng, streaming=self.streaming)
+        self.collision_manager = CollisionManager(self.player)
+        self.score = 0
+        self.xp = 0
+        self.level = 1
+        self.next_level_xp = 50
+        self.max_y = 0 # To track forward progress
+        self.status = 'alive' # Last collision result: alive, riding, hit, drowned, fell
+        self.game_over = False
+        self.ticks = 0
+        self.prev = None # Player x, y, z and camera scroll before the last tick (see interpolated)
+        self.last_dt = SIM_DT
+
+    def get_lanes(self):
+        return self.world_generator.get_lanes()
+
+    def try_move(self, action):
+        # Player only chooses a direction; the world decides whether the hop is allowed
+        dx, dy = 0, 0
+        if action == 'up': dy = -TILE_SIZE
+        elif action == 'down': dy = TILE_SIZE
+        elif action == 'left': dx = -TILE_SIZE
+        elif action == 'right': dx = TILE_SIZE
+
+        if dx != 0 or dy != 0:
+            tx = self.player.x + dx
+            ty = self.player.y + dy
+            # 1. Check Bounds
+            if 0 <= tx <= SCREEN_WIDTH - self.player.width:
+                # 2. Check Static Obstacles
+                if self.collision_manager.can_move(tx, ty, self.get_lanes()):
+                    self.player.start_move(tx, ty)
+                    if dy < 0:
+                        self.score += 1
+                        # Gain XP for moving forward (simulating collecting points)
+                        self.xp += 10
+                        if self.xp >= self.next_level_xp:
+                            self.xp = 0
+                            self.level += 1
+                            self.next_level_xp = int(self.next_level_xp * 1.5)
+
+    def step(self, dt, action=None):
+        """
+        Advance the world by `dt` seconds. `action` is one of MOVE_ACTIONS or None.
+        Returns the collision status; once the run is over the world stays frozen.
+        """
+        if self.game_over:
+            return self.status
+
+        p = self.player
+        self.prev = (p.x, p.y, p.z, self.camera.scroll_y)
+        self.last_dt = dt
+
+        if action is not None and not self.player.is_moving and not self.player.dead:
+            self.try_move(action)
+
+        profiler = self.profiler
+        
+        # Update World (Lane spawning)
+        self.player.update(dt)
+        if abs(self.player.y) > self.max_y:
+            self.max_y = abs(self.player.y)
+            self.score = int(self.max_y / TILE_SIZE) # Actually score is max distance.
+        if profiler: profiler.lap('player')
+
+        self.camera.update(self.player.y, dt)
+        self.world_generator.update(self.camera.scroll_y, dt)
+        if profiler: profiler.lap('world')
+
+        # Update Collisions
+        self.status = self.collision_manager.check_collisions(self.get_lanes(), dt)
+        if profiler: profiler.lap('collisions')
+        if self.status in ['hit', 'drowned']:
+            self.end_run()
+
+        # Update Camera bounds check (if player falls off screen)
+        # Player Y is negative. Camera scroll_y is negative.
+        # Bottom of screen is scroll_y + SCREEN_HEIGHT.
+        # If player.y > scroll_y + SCREEN_HEIGHT -> Death
+        if self.player.y > self.camera.scroll_y + SCREEN_HEIGHT + TILE_SIZE: # Buffer
+            self.status = 'fell'
+            self.end_run()
+
+        self.ticks += 1
+        return self.status
+
+    def tick(self, action=None):
+        # Fixed timestep: identical dt every tick, independent of frame time
+        return self.step(SIM_DT, action)
+
+    @contextmanager
+    def interpolated(self, alpha):
+        """
+        Inside the block, the player, camera and moving entities read `alpha` of the way from
+        their state before the last tick (0) to the current one (1). For drawing between ticks;
+        everything is restored on exit.
+        """
+        if alpha >= 1.0 or self.prev is None:
+            yield
+            return
+        p, camera, store = self.player, self.camera, self.world_generator.store
+        saved = (p.x, p.y, p.z, camera.scroll_y, store.time)
+        px, py, pz, scroll_y = self.prev
+        p.x = px + (p.x - px) * alpha
+        p.y = py + (p.y - py) * alpha
+        p.z = pz + (p.z - pz) * alpha
+        camera.scroll_y = scroll_y + (camera.scroll_y - scroll_y) * alpha
+        # Entity motion is closed-form in the store clock, so rewinding the clock moves them all
+        store.time -= (1.0 - alpha) * self.last_dt
+        try:
+            yield
+        finally:
+            p.x, p.y, p.z, camera.scroll_y, store.time = saved
+
+    def state_digest(self):
+        """Hash of the full simulation state, for checking runs are bit-identical."""
+        p = self.player
+        data = [struct.pack('<6d?i', p.x, p.y, p.z, p.move_timer, self.camera.scroll_y, self.max_y,
+                            self.game_over, self.score)]
+        for lane in self.get_lanes():
+            data.append(struct.pack('<di', lane.y, lane.index))
+            for e in lane.entities:
+                data.append(struct.pack('<2d', e.x, e.y))
+        data.append(struct.pack('<Q', self.world_generator.seed))
+        return hashlib.sha1(b''.join(data)).hexdigest()
+
+    def end_run(self):
+        self.player.die()
+        self.game_over = True
+        if self.score > self.high_score:
+            self.high_score = self.score
@@ -0,0 +1,208 @@
+"""
+Compact binary snapshots of a Simulation: world lanes and entities, spawn schedule,
+player, camera and scoring. Plain `struct` records, no pickle; a typical world is ~2 KB.
+
+    data = snapshot.dumps(sim)       # bytes
+    snapshot.loads(sim, data)        # restore in place; stepping continues bit-identically
+                                     # (ValueError, and `sim` untouched, if data is bad)
+
+    python snapshot.py crossy_snapshot.bin   # describe a saved snapshot
+"""
+import os
+import sys
+import heapq
+import random
+import struct
+from config import *
+from camera import Camera
+from player import Player
+from collision_manager import CollisionManager
+from entity_store import EntityStore, KIND_CAR, KIND_LOG, KIND_TRAIN
+from spawn_scheduler import SpawnScheduler
+from lane_ring import LaneRing
+from rng import SplitMix64
+from vehicles import Vehicle, Train
+from environment import Obstacle, Log
+
+MAGIC = b'CRSN'
+VERSION = 1
+
+# String fields are stored as indexes into these tables
+STATUSES = ('alive', 'riding', 'hit', 'drowned', 'fell')
+BIOMES = (None, 'grass', 'road', 'river', 'rail')
+EVENTS = ('spawn', 'warning', 'depart')
+LANE_TYPES = ('grass', 'road', 'river', 'rail')
+KIND_OBSTACLE = 255 # Static tree
+ENTITY_CLASSES = {KIND_CAR: Vehicle, KIND_LOG: Log, KIND_TRAIN: Train}
+
+HEADER = struct.Struct('<4sH')
+SIM = struct.Struct('<?qiiiiidB?I')
+PLAYER = struct.Struct('<8d??')
+CAMERA = struct.Struct('<3d') # scroll_y, target_scroll_y, collision last_x
+WORLD = struct.Struct('<QIIBdd') # seed, chunk index, lane index, last biome, next_y, store clock
+SCHEDULE = struct.Struct('<dII')
+EVENT = struct.Struct('<dIiB')
+LANE = struct.Struct('<BdiQH')
+MOVER = struct.Struct('<dbd') # Road/river: speed, direction, spawn timer
+RAIL = struct.Struct('<d??')
+ENTITY = struct.Struct('<Bdddd')
+
+def dumps(sim):
+    world = sim.world_generator
+    store = world.store
+    p = sim.player
+    out = [HEADER.pack(MAGIC, VERSION),
+           SIM.pack(sim.seed is not None, sim.seed or 0, sim.high_score, sim.score, sim.xp, sim.level,
+                    sim.next_level_xp, sim.max_y, STATUSES.index(sim.status), sim.game_over, sim.ticks),
+           PLAYER.pack(p.x, p.y, p.z, p.start_x, p.start_y, p.target_x, p.target_y, p.move_timer,
+                       p.is_moving, p.dead),
+           CAMERA.pack(sim.camera.scroll_y, sim.camera.target_scroll_y, sim.collision_manager.last_x),
+           WORLD.pack(world.seed, world.chunk_index, world.lane_index, BIOMES.index(world.last_biome),
+                      world.next_y, store.time)]
+
+    scheduler = world.scheduler
+    out.append(SCHEDULE.pack(scheduler.time, scheduler.seq, len(scheduler.queue)))
+    for due, seq, row, event in scheduler.queue:
+        out.append(EVENT.pack(due, seq, row, EVENTS.index(event)))
+
+    lanes = list(world.lanes)
+    out.append(struct.pack('<I', len(lanes)))
+    for lane in lanes:
+        out.append(LANE.pack(LANE_TYPES.index(lane.type), lane.y, lane.index, lane.rng.state, len(lane.entities)))
+        if lane.type in ('road', 'river'):
+            out.append(MOVER.pack(lane.speed, lane.direction, lane.spawn_timer))
+        elif lane.type == 'rail':
+            out.append(RAIL.pack(lane.train_timer, lane.train_active, lane.train_passing))
+        for e in lane.entities:
+            if getattr(e, 'kind', None) is None:
+                out.append(ENTITY.pack(KIND_OBSTACLE, e.x, 0.0, e.width, 0.0))
+            elif e.slot < 0:
+                # Spawned this frame, not yet in the store: it gets t0 = now when flushed
+                out.append(ENTITY.pack(e.kind, e._x, store.time, e.width, e.speed))
+            else:
+                out.append(ENTITY.pack(e.kind, store.x[e.slot], store.t0[e.slot], e.width, e.speed))
+    return b''.join(out)
+
+# Simulation attributes that belong to the instance, not to the run, and survive a load
+KEEP = ('streaming', 'profiler', 'run_seed')
+
+def loads(sim, data):
+    """
+    Replace the state of `sim` with the snapshot in `data`. The snapshot is parsed into a
+    scratch Simulation first, so bad data raises ValueError and leaves `sim` as it was.
+    """
+    from simulation import Simulation
+    staged = Simulation(0)
+    try:
+        _parse(staged, data)
+    except (struct.error, IndexError, KeyError) as e:
+        raise ValueError(f"Corrupt snapshot: {e}") from None
+    finally:
+        staged.world_generator.close()
+
+    old = sim.world_generator
+    kept = {name: getattr(sim, name) for name in KEEP}
+    vars(sim).update(vars(staged), **kept)
+    old.close()
+    world = sim.world_generator
+    world.streaming = sim.streaming
+    world.open_chunks()
+
+def _parse(sim, data):
+    # Fills a scratch Simulation; may raise partway through
+    view = memoryview(data)
+    offset = 0
+    def read(record):
+        nonlocal offset
+        values = record.unpack_from(view, offset)
+        offset += record.size
+        return values
+
+    magic, version = read(HEADER)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a version {VERSION} snapshot")
+
+    has_seed, seed, sim.high_score, sim.score, sim.xp, sim.level, sim.next_level_xp, sim.max_y, \
+        status, sim.game_over, sim.ticks = read(SIM)
+    sim.seed = seed if has_seed else None
+    sim.rng = random.Random(sim.seed) # Only seeds new worlds; this one is restored below
+    sim.status = STATUSES[status]
+    sim.prev = None # Nothing to interpolate from until the next tick
+
+    p = sim.player = Player(0, 0)
+    p.x, p.y, p.z, p.start_x, p.start_y, p.target_x, p.target_y, p.move_timer, p.is_moving, p.dead = read(PLAYER)
+    sim.camera = Camera()
+    sim.collision_manager = CollisionManager(p)
+    sim.camera.scroll_y, sim.camera.target_scroll_y, sim.collision_manager.last_x = read(CAMERA)
+
+    world = sim.world_generator
+    world.close()
+    world.seed, world.chunk_index, world.lane_index, last_biome, world.next_y, store_time = read(WORLD)
+    world.last_biome = BIOMES[last_biome]
+    store = world.store = EntityStore()
+    store.time = store_time
+    world.lanes = LaneRing()
+
+    scheduler = world.scheduler = SpawnScheduler()
+    scheduler.time, scheduler.seq, count = read(SCHEDULE)
+    for _ in range(count):
+        due, seq, row, event = read(EVENT)
+        scheduler.queue.append((due, seq, row, EVENTS[event]))
+    heapq.heapify(scheduler.queue)
+
+    moving = [] # (entity, t0)
+    count, = struct.unpack_from('<I', view, offset)
+    offset += 4
+    for _ in range(count):
+        lane_type, y, index, rng_state, entity_count = read(LANE)
+        lane_type = LANE_TYPES[lane_type]
+        # Build the lane, then overwrite everything its constructor rolled
+        lane = world.make_lane(lane_type, y, index, SplitMix64(), direction_override=1)
+        if lane_type in ('road', 'river'):
+            lane.speed, lane.direction, lane.spawn_timer = read(MOVER)
+        elif lane_type == 'rail':
+            lane.train_timer, lane.train_active, lane.train_passing = read(RAIL)
+        lane.rng.state = rng_state
+
+        lane.entities = []
+        for _ in range(entity_count):
+            kind, x, t0, width, speed = read(ENTITY)
+            if kind == KIND_OBSTACLE:
+                lane.entities.append(Obstacle(x, y))
+                continue
+            if kind == KIND_TRAIN:
+                e = Train(x, y, speed)
+            else:
+                e = ENTITY_CLASSES[kind](x, y, width, speed)
+            e.speed = speed # Exact values, not recomputed by the constructor
+            e.width = width
+            lane.add_entity(e)
+            moving.append((e, t0))
+        world.lanes.append(lane)
+
+    # Bind every obstacle, then put back the spawn times and exits it had
+    store.flush()
+    store.exits = []
+    for e, t0 in moving:
+        store.t0[e.slot] = t0
+        store.schedule_exit(e.slot)
+
+
+def save(sim, path):
+    # Write then rename, so an interrupted save never leaves a truncated snapshot behind
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(dumps(sim))
+    os.replace(tmp, path)
+
+def load(sim, path):
+    with open(path, 'rb') as f:
+        loads(sim, f.read())
+
+if __name__ == "__main__":
+    from simulation import Simulation
+    sim = Simulation(0)
+    load(sim, sys.argv[1])
+    lanes = sim.get_lanes()
+    print(f"seed {sim.seed}, tick {sim.ticks}, score {sim.score}, status {sim.status}, "
+          f"{len(lanes)} lanes, {sum(len(l.entities) for l in lanes)} entities, digest {sim.state_digest()}")
@@ -0,0 +1,43 @@
+import heapq
+
+class SpawnScheduler:
+    """
+    Central timeline for lane events (car/log spawns, train warnings and departures).
+    A min-heap of (due time, seq, lane row, event): a frame only pays for the events
+    that actually come due, however many lanes exist.
+
+    Lanes describe their first event with `initial_event()` and handle each one in
+    `fire(event)`, which returns the next (delay, event) or None.
+    """
+    def __init__(self):
+        self.time = 0.0 # Sim clock, seconds since the world was created
+        self.queue = []
+        self.seq = 0 # Tie-break so equal due times pop in scheduling order
+
+    def __len__(self):
+        return len(self.queue)
+
+    def add(self, lane, delay, event):
+        heapq.heappush(self.queue, (self.time + delay, self.seq, lane.index, event))
+        self.seq += 1
+
+    def advance(self, dt, lanes):
+        self.time += dt
+        queue = self.queue
+        if not queue or queue[0][0] > self.time:
+            return
+
+        due = []
+        while queue and queue[0][0] <= self.time:
+            due.append(heapq.heappop(queue))
+        # Same-frame events fire bottom lane first, like the old per-lane update loop,
+        # so seeded runs draw from the rng in the same order
+        due.sort(key=lambda item: (item[2], item[1]))
+
+        for _, _, row, event in due:
+            lane = lanes.get(row)
+            if lane is None:
+                continue # Lane was culled; its pending event goes with it
+            follow_up = lane.fire(event)
+            if follow_up is not None:
+                self.add(lane, *follow_up)
@@ -0,0 +1,13 @@
+import os
+import sys
+
+# The game's modules live flat at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def scripted_action(tick):
+    """Fixed input pattern shared by the tests: mostly forward, with some sidesteps."""
+    if tick % 20 == 0: return 'up'
+    if tick % 47 == 0: return 'left'
+    if tick % 31 == 0: return 'right'
+    return None
@@ -0,0 +1,13 @@
+from asset_manager import AssetManager
+
+def test_prune_only_removes_stale_generated_entries(tmp_path):
+    names = ['fonts-0123456789abcdef.json', 'sprites-0123456789abcdef.bin', # Stale entries
+             'fonts-aaaaaaaaaaaaaaaa.json', # Current entry
+             'fonts-notes.txt', 'sprites-mine.bin', 'sprites-0123456789abcdef.bin.bak', 'other.txt']
+    for name in names:
+        (tmp_path / name).write_bytes(b'')
+    manager = AssetManager()
+    manager.disk_cache_dir = str(tmp_path)
+    manager._prune_cache('fonts-aaaaaaaaaaaaaaaa.json')
+    manager._prune_cache('sprites-bbbbbbbbbbbbbbbb.bin')
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(names[2:])
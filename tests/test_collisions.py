@@ -0,0 +1,55 @@
+import random
+from config import TILE_SIZE
+from collision_manager import CollisionManager
+from lane import RailLane
+from lane_ring import LaneRing
+from player import Player
+from vehicles import Train
+
+DT = 0.5 # One long frame: the train covers 1000 px, far more than the player's width
+SPEED = 2000
+LANE_Y = -TILE_SIZE
+PLAYER_X = 300
+
+def check(x_end, speed):
+    """Status for a standing player and a train that ends the frame at `x_end` on its lane."""
+    player = Player(PLAYER_X, LANE_Y)
+    manager = CollisionManager(player)
+    lane = RailLane(LANE_Y, 1, rng=random.Random(0))
+    train = Train(x_end, LANE_Y, 0)
+    train.speed = speed
+    lane.entities = [train]
+    lanes = LaneRing()
+    lanes.append(lane)
+    return manager.check_collisions(lanes, DT)
+
+# Player hitbox (2 px inside on each side) and train length
+PLAYER = Player(PLAYER_X, LANE_Y)
+LEFT = PLAYER.x + 2
+RIGHT = PLAYER.x + PLAYER.width - 2
+TRAIN = Train(0, LANE_Y, 0).width
+
+def overlaps(x):
+    return x < RIGHT and LEFT < x + TRAIN
+
+def test_train_passing_through_within_one_frame_hits():
+    for speed in (SPEED, -SPEED):
+        travel = speed * DT
+        # Centred on the player halfway through the frame
+        x_end = (LEFT + RIGHT) / 2 - TRAIN / 2 + travel / 2
+        assert not overlaps(x_end - travel) and not overlaps(x_end) # Clear at both ends of the frame
+        assert check(x_end, speed) == 'hit'
+
+def test_near_misses_on_both_sides_stay_alive():
+    for speed in (SPEED, -SPEED):
+        travel = speed * DT
+        # Still short of the player at the end of the frame
+        ahead = LEFT - TRAIN - 1 if speed > 0 else RIGHT + 1
+        # Already past the player at the start of the frame
+        behind = (RIGHT + 1 if speed > 0 else LEFT - TRAIN - 1) + travel
+        assert check(ahead, speed) == 'alive'
+        assert check(behind, speed) == 'alive'
+        # Two pixels closer is a hit
+        step = 2 if speed > 0 else -2
+        assert check(ahead + step, speed) == 'hit'
+        assert check(behind - step, speed) == 'hit'
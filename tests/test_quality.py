@@ -0,0 +1,70 @@
+from quality import QualityGovernor, QUALITY_TIERS
+
+SLOW = 20.0 # ms, over the 10 ms budget
+FAST = 2.0 # Under the headroom (5 ms)
+OK = 7.0 # Under budget, but without headroom
+
+def governor(mode='auto'):
+    return QualityGovernor(budget_ms=10.0, window=4, headroom=0.5, recover_frames=10, mode=mode)
+
+def feed(gov, frame_ms, frames):
+    """Frames fed until the tier changed (inclusive), or None if it never did."""
+    for n in range(1, frames + 1):
+        if gov.update(frame_ms):
+            return n
+    return None
+
+def test_steps_down_one_tier_per_full_slow_window():
+    gov = governor()
+    for tier in range(1, len(QUALITY_TIERS)):
+        assert feed(gov, SLOW, 100) == 4
+        assert gov.tier == tier
+    assert feed(gov, SLOW, 100) is None # Already at the lowest tier
+
+def test_single_spike_does_not_step_down():
+    gov = governor()
+    assert feed(gov, FAST, 3) is None
+    assert feed(gov, 25.0, 1) is None # Mean of the window is still under budget
+    assert gov.tier == 0
+
+def test_steps_up_only_after_recover_frames_with_headroom():
+    gov = governor()
+    feed(gov, SLOW, 4)
+    assert gov.tier == 1
+    # A fresh window to fill, then 10 calm frames in a row
+    assert feed(gov, FAST, 100) == 3 + 10
+    assert gov.tier == 0
+
+def test_frames_without_headroom_restart_the_recovery():
+    gov = governor()
+    feed(gov, SLOW, 4)
+    assert feed(gov, FAST, 3 + 9) is None # One calm frame short
+    assert feed(gov, 15.0, 1) is None # Window mean 5.25 ms: under budget, but no headroom
+    assert gov.calm == 0
+    # Calm again once that frame has left the window, and the count starts over
+    assert feed(gov, FAST, 100) == 3 + 10
+    assert gov.tier == 0
+
+def test_failed_step_up_backs_off_up_to_8x():
+    gov = governor()
+    feed(gov, SLOW, 4)
+    waits = []
+    for _ in range(5):
+        waits.append(feed(gov, FAST, 1000) - 3) # Calm frames needed to step up
+        assert feed(gov, SLOW, 4) == 4 # ...which does not hold
+    assert waits == [10, 20, 40, 80, 80]
+
+def test_held_step_up_keeps_the_recovery_delay():
+    gov = governor()
+    feed(gov, SLOW, 4)
+    feed(gov, FAST, 1000)
+    feed(gov, OK, 50) # Stays up well past 2 windows
+    feed(gov, SLOW, 4)
+    assert gov.recover_frames == 10
+
+def test_fixed_mode_never_changes():
+    gov = governor(mode='3')
+    assert gov.current is QUALITY_TIERS[3]
+    assert feed(gov, SLOW, 100) is None
+    assert feed(gov, FAST, 1000) is None
+    assert governor(mode='99').tier == len(QUALITY_TIERS) - 1
@@ -0,0 +1,34 @@
+import random
+from config import SIM_DT
+from replay import Replay, play, numbered_path
+from simulation import Simulation, MOVE_ACTIONS
+
+def record(seed, ticks, fixed):
+    # Drive a Simulation the way Game does, logging what each step was given
+    rng = random.Random(seed)
+    sim = Simulation(seed)
+    replay = Replay(sim.run_seed, SIM_DT, fixed)
+    for _ in range(ticks):
+        action = rng.choice(MOVE_ACTIONS) if rng.random() < 0.1 else None
+        dt = SIM_DT if fixed else rng.choice((0.004, 0.016, 0.033))
+        sim.step(dt, action)
+        replay.record(action, dt)
+        if sim.game_over:
+            break
+    return sim, replay
+
+def test_round_trip_and_playback():
+    for fixed in (True, False):
+        sim, replay = record(5, 1500, fixed)
+        loaded = Replay.loads(replay.dumps())
+        assert list(loaded.steps()) == list(replay.steps())
+
+        played, _ = play(loaded)
+        assert played.ticks == sim.ticks
+        assert played.state_digest() == sim.state_digest()
+
+def test_numbered_path_skips_existing(tmp_path):
+    path = str(tmp_path / 'run.crp')
+    assert numbered_path(path) == str(tmp_path / 'run-001.crp')
+    (tmp_path / 'run-001.crp').write_bytes(b'')
+    assert numbered_path(path) == str(tmp_path / 'run-002.crp')
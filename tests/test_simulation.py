@@ -0,0 +1,28 @@
+from conftest import scripted_action
+from simulation import Simulation
+
+def run(sim, ticks):
+    # Digest at every game over (then a fresh run) and at the end
+    digests = []
+    for i in range(ticks):
+        sim.tick(scripted_action(i))
+        if sim.game_over:
+            digests.append(sim.state_digest())
+            sim.reset()
+    digests.append(sim.state_digest())
+    return digests
+
+def test_same_seed_and_inputs_give_same_digest():
+    for seed in (1, 2, 3):
+        assert run(Simulation(seed), 2000) == run(Simulation(seed), 2000)
+
+def test_different_seeds_differ():
+    assert run(Simulation(1), 300) != run(Simulation(2), 300)
+
+def test_streamed_world_matches_inline():
+    for seed in (1, 2):
+        streamed = Simulation(seed, streaming=True)
+        try:
+            assert run(streamed, 2000) == run(Simulation(seed), 2000)
+        finally:
+            streamed.world_generator.close()
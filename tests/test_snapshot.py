@@ -0,0 +1,61 @@
+import pytest
+import snapshot
+from conftest import scripted_action
+from simulation import Simulation
+
+def advance(sim, start, ticks):
+    for i in range(start, start + ticks):
+        sim.tick(scripted_action(i))
+
+def test_restored_run_continues_identically():
+    for seed, at in ((1, 60), (2, 150), (3, 240)):
+        sim = Simulation(seed)
+        advance(sim, 0, at)
+        data = snapshot.dumps(sim)
+
+        restored = Simulation(0)
+        snapshot.loads(restored, data)
+        assert restored.state_digest() == sim.state_digest()
+        assert snapshot.dumps(restored) == data
+
+        advance(sim, at, 400)
+        advance(restored, at, 400)
+        assert restored.state_digest() == sim.state_digest()
+
+def test_rejects_other_data():
+    with pytest.raises(ValueError):
+        snapshot.loads(Simulation(0), b'XXXX' + bytes(64))
+
+def test_bad_data_leaves_the_run_untouched():
+    source = Simulation(4)
+    advance(source, 0, 120)
+    data = snapshot.dumps(source)
+
+    sim = Simulation(7, streaming=True)
+    try:
+        advance(sim, 0, 90)
+        digest = sim.state_digest()
+        for bad in (data[:len(data) // 2], data[:-3], data[:20]):
+            with pytest.raises(ValueError):
+                snapshot.loads(sim, bad)
+            assert sim.state_digest() == digest
+        # The chunk stream still runs: the player can keep going up into new chunks
+        advance(sim, 90, 600)
+        assert not sim.world_generator.chunks.stopped.is_set()
+        # A good snapshot still loads, and keeps the world streaming
+        snapshot.loads(sim, data)
+        assert sim.state_digest() == source.state_digest()
+        assert sim.streaming and not sim.world_generator.chunks.stopped.is_set()
+    finally:
+        sim.world_generator.close()
+
+def test_save_replaces_file_atomically(tmp_path):
+    sim = Simulation(2)
+    advance(sim, 0, 60)
+    path = str(tmp_path / 'snap.bin')
+    snapshot.save(sim, path)
+    snapshot.save(sim, path)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['snap.bin']
+    restored = Simulation(0)
+    snapshot.load(restored, path)
+    assert restored.state_digest() == sim.state_digest()
@@ -2,21 +2,71 @@
 import pygame
 from config import *
 
+class TextCache:
+    """
+    Rendered labels, one entry per label slot. A slot is only re-rasterized
+    when its text changes, so steady-state frames never call font.render.
+    """
+    def __init__(self, asset_manager):
+        self.asset_manager = asset_manager
+        self.entries = {} # slot -> (font name, text, color, surface)
+        self.renders = 0 # font.render calls, for checking the cache works
+
+    def get(self, slot, font_name, text, color):
+        entry = self.entries.get(slot)
+        if entry is not None and entry[0] == font_name and entry[1] == text and entry[2] == color:
+            return entry[3]
+        surf = self.asset_manager.fonts[font_name].render(text, True, color)
+        self.renders += 1
+        self.entries[slot] = (font_name, text, color, surf)
+        return surf
+
+
+class GlyphAtlas:
+    """
+    The digits 0-9 of one font and color pre-rendered side by side on a single surface.
+    Numbers are composed by blitting glyph areas, with no font rasterization per frame.
+    """
+    def __init__(self, font, color, glyphs="0123456789"):
+        rendered = [font.render(ch, True, color) for ch in glyphs]
+        height = max(g.get_height() for g in rendered)
+        self.surface = pygame.Surface((sum(g.get_width() for g in rendered), height), pygame.SRCALPHA)
+        self.areas = {}
+        x = 0
+        for ch, g in zip(glyphs, rendered):
+            self.surface.blit(g, (x, 0))
+            self.areas[ch] = pygame.Rect(x, 0, g.get_width(), height)
+            x += g.get_width()
+
+    def draw(self, surface, text, pos):
+        x, y = pos
+        blits = []
+        for ch in text:
+            area = self.areas[ch]
+            blits.append((self.surface, (x, y), area))
+            x += area.width
+        surface.blits(blits, doreturn=False)
+
+
 class UIManager:
     def __init__(self, asset_manager):
         self.asset_manager = asset_manager
+        self.overlay = None # Game over dimming layer, allocated once
+        self.text = TextCache(asset_manager)
+        self.score_glyphs = None # White / shadow digit atlases, built on first use
+        self.shadow_glyphs = None
         
     def render_game_ui(self, surface, score, high_score, xp=0, next_xp=100, level=1):
-        # Top Left: Score
-        score_surf = self.asset_manager.fonts['score'].render(str(score), True, (255, 255, 255))
+        # Top Left: Score, composed from pre-rendered digits
+        if self.score_glyphs is None:
+            self.score_glyphs = GlyphAtlas(self.asset_manager.fonts['score'], (255, 255, 255))
+            self.shadow_glyphs = GlyphAtlas(self.asset_manager.fonts['score'], (0, 0, 0))
         # Add shadow
-        shadow_surf = self.asset_manager.fonts['score'].render(str(score), True, (0, 0, 0))
-        surface.blit(shadow_surf, (22, 22))
-        surface.blit(score_surf, (20, 20))
+        self.shadow_glyphs.draw(surface, str(score), (22, 22))
+        self.score_glyphs.draw(surface, str(score), (20, 20))
         
         # High Score
-        hs_text = f"HI {high_score}"
-        hs_surf = self.asset_manager.fonts['main'].render(hs_text, True, (255, 255, 0))
+        hs_surf = self.text.get('high_score', 'main', f"HI {high_score}", (255, 255, 0))
         surface.blit(hs_surf, (20, 70))
         
         # Experience Bar (Top Center)
@@ -41,30 +91,41 @@ class UIManager:
             pygame.draw.rect(surface, (255, 50, 50), fill_rect, border_radius=5)
             
         # Label "EXP" (Right of bar)
-        exp_surf = self.asset_manager.fonts['main'].render("EXP", True, (255, 200, 0))
+        exp_surf = self.text.get('exp', 'main', "EXP", (255, 200, 0))
         surface.blit(exp_surf, (bar_x + bar_width + 10, bar_y))
         
         # Level (Left of bar)
-        lvl_surf = self.asset_manager.fonts['main'].render(f"LVL {level}", True, (255, 255, 255))
+        lvl_surf = self.text.get('level', 'main', f"LVL {level}", (255, 255, 255))
         surface.blit(lvl_surf, (bar_x - lvl_surf.get_width() - 10, bar_y))
         
     def render_game_over(self, surface, score, high_score):
         # Darken screen
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))
-        surface.blit(overlay, (0, 0))
+        if self.overlay is None:
+            self.overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+            self.overlay.fill((0, 0, 0, 150))
+        surface.blit(self.overlay, (0, 0))
         
         # Game Over Text
-        go_surf = self.asset_manager.fonts['gameover'].render("GAME OVER", True, (255, 255, 255))
+        go_surf = self.text.get('game_over', 'gameover', "GAME OVER", (255, 255, 255))
         go_rect = go_surf.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 - 50))
         surface.blit(go_surf, go_rect)
         
         # Score
-        score_surf = self.asset_manager.fonts['score'].render(f"Score: {score}", True, (255, 255, 255))
+        score_surf = self.text.get('final_score', 'score', f"Score: {score}", (255, 255, 255))
         score_rect = score_surf.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 + 20))
         surface.blit(score_surf, score_rect)
         
         # Restart Prompt
-        prompt_surf = self.asset_manager.fonts['main'].render("Press ENTER to Restart", True, (200, 200, 200))
+        prompt_surf = self.text.get('restart', 'main', "Press ENTER to Restart", (200, 200, 200))
         prompt_rect = prompt_surf.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 + 80))
         surface.blit(prompt_surf, prompt_rect)
+        
+    def render_menu(self, surface):
+        # Reuse Game Over style or simple start text
+        title_surf = self.text.get('title', 'gameover', TITLE, (255, 255, 255))
+        rect = title_surf.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/3))
+        surface.blit(title_surf, rect)
+        
+        sub_surf = self.text.get('start', 'main', "Press ENTER to Start", (255, 255, 255))
+        rect2 = sub_surf.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2))
+        surface.blit(sub_surf, rect2)
@@ -1,20 +1,38 @@
-
 import random
 from config import *
 from lane import GrassLane, RoadLane, RiverLane, RailLane
+from entity_store import EntityStore
+from lane_ring import LaneRing
+from entity_pool import EntityPool
+from spawn_scheduler import SpawnScheduler
+from chunk_stream import ChunkStream
+from rng import SplitMix64
 
 class WorldGenerator:
-    def __init__(self):
-        self.lanes = []
-        self.next_y = 0 # Starting Y
-        self.lane_index = 0
+    def __init__(self, rng=random, streaming=False, lookahead=CHUNK_LOOKAHEAD):
+        # World randomness comes from this one source: it seeds the chunk stream below,
+        # so a seeded random.Random makes a run reproducible.
+        self.rng = rng
+        self.store = EntityStore() # Cars, logs and trains of every lane, moved in bulk
+        self.pool = EntityPool() # Despawned cars, logs and trains, recycled on the next spawn
+        self.scheduler = SpawnScheduler() # Spawns and train signals of every lane, by due time
+        self.lanes = LaneRing() # Indexed by row: O(1) lane_at(y), cheap append/evict at the ends
+        self.next_y = 0 # Y of the next lane to add
         
+        # Chunk n is built only from (seed, n), so it is the same world whether chunks are
+        # built inline or by the streaming worker thread
+        self.seed = rng.getrandbits(64)
+        self.streaming = streaming
+        self.lookahead = lookahead
+        # Frontier of the chunk source: next chunk number, next lane index, biome to follow
+        self.chunk_index = 0
+        self.lane_index = 0
         self.last_biome = None
+        self.chunks = None
+        self.open_chunks()
 
-        # Initial safe zone
-        for i in range(5):
-            self.add_lane('grass_safe')
-            self.last_biome = 'grass'
+        # Initial safe zone (chunk 0)
+        self.add_chunk()
             
     def update(self, camera_y, dt):
         # Cull old lanes
@@ -24,86 +42,131 @@ class WorldGenerator:
         # We cull if lane.y > camera.scroll_y + SCREEN_HEIGHT + Buffer
         
         cull_threshold = camera_y + SCREEN_HEIGHT + 200
-        self.lanes = [l for l in self.lanes if l.y < cull_threshold]
+        while len(self.lanes) and self.lanes.peek_oldest().y >= cull_threshold:
+            self.lanes.pop_oldest().release()
         
-        # Generate new lanes
+        # Add new lanes
         # Top of screen is camera.scroll_y
         # We want to generate up to camera.scroll_y - Buffer
         gen_threshold = camera_y - 100
         
         while self.next_y > gen_threshold:
-            self.generate_next_batch()
+            self.add_chunk()
             
-        # Update lanes
-        for lane in self.lanes:
-            lane.update(dt)
+        # Move and cull all obstacles at once, then let lanes drop what left the band
+        for e in self.store.update(dt):
+            lane = self.lanes.get(e.lane_id)
+            if lane is not None:
+                lane.entities.remove(e)
+            self.pool.release(e)
+            
+        self.update_lanes(dt)
+        
+    def update_lanes(self, dt):
+        # Per-lane logic (spawns, train signals) only runs for events that come due
+        self.scheduler.advance(dt, self.lanes)
+
+    def open_chunks(self):
+        # (Re)start the chunk source at the current frontier
+        self.close()
+        chunks = self.chunk_source(self.chunk_index, self.next_y, self.lane_index, self.last_biome)
+        self.chunks = ChunkStream(chunks, self.lookahead) if self.streaming else chunks
 
-    def add_lane(self, lane_type, difficulty_multiplier=1.0, direction_override=None):
+    def add_chunk(self):
+        # Built ahead of time (or right now, without streaming); only bookkeeping happens here
+        biome, chunk = next(self.chunks)
+        for lane in chunk:
+            self.lanes.append(lane)
+            event = lane.initial_event()
+            if event is not None:
+                self.scheduler.add(lane, *event)
+            self.next_y = lane.y - TILE_SIZE
+            self.lane_index = lane.index + 1
+        self.last_biome = biome
+        self.chunk_index += 1
+
+    def close(self):
+        if isinstance(self.chunks, ChunkStream):
+            self.chunks.close()
+
+    def make_lane(self, lane_type, y, index, rng, direction_override=None):
+        # Lanes only keep references to the store and pool here; nothing is registered yet
         if lane_type == 'grass_safe':
-            l = GrassLane(self.next_y, self.lane_index)
+            l = GrassLane(y, index, rng=rng, store=self.store, pool=self.pool)
             l.entities = [] # Clear obstacles
         elif lane_type == 'grass':
-            l = GrassLane(self.next_y, self.lane_index)
+            l = GrassLane(y, index, rng=rng, store=self.store, pool=self.pool)
         elif lane_type == 'road':
-            speed = 100 + (self.lane_index * 0.5) # Scale speed
-            direction = direction_override if direction_override is not None else random.choice([-1, 1])
-            l = RoadLane(self.next_y, self.lane_index, speed=speed, direction=direction)
+            speed = 100 + (index * 0.5) # Scale speed
+            direction = direction_override if direction_override is not None else rng.choice([-1, 1])
+            l = RoadLane(y, index, speed=speed, direction=direction, rng=rng, store=self.store, pool=self.pool)
         elif lane_type == 'river':
-            speed = 80 + (self.lane_index * 0.4)
-            direction = direction_override if direction_override is not None else random.choice([-1, 1])
-            l = RiverLane(self.next_y, self.lane_index, speed=speed, direction=direction)
+            speed = 80 + (index * 0.4)
+            direction = direction_override if direction_override is not None else rng.choice([-1, 1])
+            l = RiverLane(y, index, speed=speed, direction=direction, rng=rng, store=self.store, pool=self.pool)
         elif lane_type == 'rail':
-             l = RailLane(self.next_y, self.lane_index)
-             
-        self.lanes.append(l)
-        self.next_y -= TILE_SIZE
-        self.lane_index += 1
+             l = RailLane(y, index, rng=rng, store=self.store, pool=self.pool)
+        return l
 
-    def generate_next_batch(self):
+    def chunk_source(self, n, y, index, last_biome):
+        """
+        Endless (biome, lanes) chunks starting at chunk n, lanes bottom to top.
+        Chunk n draws only from a Random derived from (seed, n); every lane gets its own
+        SplitMix64 for its spawns, so lanes don't depend on the order anything else runs in.
+        """
+        while True:
+            rng = random.Random(f"{self.seed}:{n}")
+            if n == 0:
+                biome, plan = 'grass', [('grass_safe', None)] * 5
+            else:
+                biome, plan = self.plan_biome(rng, last_biome)
+            
+            chunk = []
+            for lane_type, direction in plan:
+                lane_rng = SplitMix64(rng.getrandbits(64))
+                chunk.append(self.make_lane(lane_type, y, index, lane_rng, direction))
+                y -= TILE_SIZE
+                index += 1
+            last_biome = biome
+            n += 1
+            yield biome, chunk
+
+    def plan_biome(self, rng, last_biome):
+        """Next biome and its lanes as (lane type, direction override) pairs."""
         # Biomes: Field (Grass), Highway (Roads), Water (Rivers), Track (Rails)
         # Ensure we don't repeat the same biome to keep sizes restrained
         
         available_biomes = ['grass', 'road', 'river', 'rail']
         
         # Simple weighted selection logic that respects "don't repeat"
-        if self.last_biome in available_biomes:
-            available_biomes.remove(self.last_biome)
+        if last_biome in available_biomes:
+            available_biomes.remove(last_biome)
             
-        choice = random.choice(available_biomes)
+        choice = rng.choice(available_biomes)
         
         # Difficulty scaling could adjust specific params, but type selection is now uniform among remaining
         
         if choice == 'grass':
-            count = random.randint(3, 5)
-            for _ in range(count): self.add_lane('grass')
-            self.last_biome = 'grass'
+            count = rng.randint(3, 5)
+            return 'grass', [('grass', None)] * count
             
         elif choice == 'road':
-            count = random.randint(3, 5)
-            for _ in range(count): self.add_lane('road')
-            self.last_biome = 'road'
+            count = rng.randint(3, 5)
+            return 'road', [('road', None)] * count
             
         elif choice == 'river':
-            count = random.randint(3, 5)
+            count = rng.randint(3, 5)
             # Alternate flow direction for adjacent rivers
-            start_dir = random.choice([-1, 1])
-            for i in range(count): 
-                # i=0 -> start_dir, i=1 -> -start_dir, etc.
-                direction = start_dir * (1 if i % 2 == 0 else -1)
-                
-                # We need to modify add_lane to accept explicit direction for river
-                # Currently add_lane randomizes it internally for river/road if not exposed.
-                # Let's override it by modifying add_lane signature or just hacking it here.
-                # Actually `add_lane` generates the lane object.
-                # Let's extract the creation logic or pass kwargs.
-                self.add_lane('river', direction_override=direction)
-                
-            self.last_biome = 'river'
+            start_dir = rng.choice([-1, 1])
+            # i=0 -> start_dir, i=1 -> -start_dir, etc.
+            return 'river', [('river', start_dir * (1 if i % 2 == 0 else -1)) for i in range(count)]
             
         elif choice == 'rail':
             # Rails are usually single or distinct.
-            self.add_lane('rail')
-            self.last_biome = 'rail'
+            return 'rail', [('rail', None)]
             
     def get_lanes(self):
         return self.lanes
+        
+    def lane_at(self, y):
+        return self.lanes.lane_at(y)